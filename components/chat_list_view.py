@@ -0,0 +1,289 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView, QStyle
+from PyQt5.QtGui import (QFont, QFontMetrics, QPainter, QPainterPath, QColor,
+                         QLinearGradient, QTextLayout, QTextOption)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QPoint, pyqtSignal
+from components.shadow import draw_shadow
+
+
+class ChatListModel(QAbstractListModel):
+    """Conversations as rows of [key, username, message, time].
+
+    key identifies a conversation across refreshes (the other participant's
+    wire-format username); set_chats() reconciles against it so unchanged
+    rows keep their indexes, selection and scroll position.
+    """
+    UsernameRole = Qt.UserRole + 1
+    TimeRole = Qt.UserRole + 2
+    KeyRole = Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.chats = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.chats)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key, username, message, time = self.chats[index.row()]
+        if role == Qt.DisplayRole:
+            return message
+        if role == self.UsernameRole:
+            return username
+        if role == self.TimeRole:
+            return time
+        if role == self.KeyRole:
+            return key
+        return None
+
+    def set_chats(self, rows):
+        """Reconcile the model with (key, username, message, time) rows"""
+        rows = [list(row) for row in rows]
+        wanted = {row[0] for row in rows}
+
+        end = len(self.chats)
+        while end > 0:
+            if self.chats[end - 1][0] in wanted:
+                end -= 1
+                continue
+            start = end - 1
+            while start > 0 and self.chats[start - 1][0] not in wanted:
+                start -= 1
+            self.beginRemoveRows(QModelIndex(), start, end - 1)
+            del self.chats[start:end]
+            self.endRemoveRows()
+            end = start
+
+        known = {chat[0] for chat in self.chats}
+        added = [row for row in rows if row[0] not in known]
+        if added:
+            start = len(self.chats)
+            self.beginInsertRows(QModelIndex(), start,
+                                 start + len(added) - 1)
+            self.chats.extend(added)
+            self.endInsertRows()
+
+        if [chat[0] for chat in self.chats] != [row[0] for row in rows]:
+            self.layoutAboutToBeChanged.emit()
+            positions = {row[0]: position
+                         for position, row in enumerate(rows)}
+            old_keys = [chat[0] for chat in self.chats]
+            old_indexes = self.persistentIndexList()
+            self.chats.sort(key=lambda chat: positions[chat[0]])
+            self.changePersistentIndexList(old_indexes, [
+                self.index(positions[old_keys[index.row()]])
+                for index in old_indexes])
+            self.layoutChanged.emit()
+
+        for position, (chat, row) in enumerate(zip(self.chats, rows)):
+            if chat != row:
+                self.chats[position] = row
+                model_index = self.index(position)
+                self.dataChanged.emit(model_index, model_index)
+
+    def clear(self):
+        """Remove every conversation"""
+        self.beginResetModel()
+        self.chats = []
+        self.endResetModel()
+
+
+class ChatListDelegate(QStyledItemDelegate):
+    """Paints conversation cards without creating a widget per row.
+
+    The last message is wrapped to at most PREVIEW_LINES lines, with an
+    ellipsis on the last one if it does not fit. Every card leaves room for
+    all of them, so rows share one height and the view can lay out a long
+    list without measuring each row.
+    """
+    ROW_HEIGHT = 80
+    SPACING = 12
+    PADDING_X = 16
+    PADDING_Y = 12
+    HEADER_SPACING = 8
+    PREVIEW_LINES = 2
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.username_font = QFont("Segoe UI", 12, QFont.Bold)
+        self.time_font = QFont("Segoe UI", 9)
+        self.message_font = QFont("Segoe UI", 10)
+        self.message_metrics = QFontMetrics(self.message_font)
+        self.header_height = max(QFontMetrics(self.username_font).height(),
+                                 QFontMetrics(self.time_font).height())
+        self.preview_cache = {}
+
+    def preview_width(self, row_width):
+        """Width available to the message preview in a row"""
+        return row_width - 10 - 2 * self.PADDING_X
+
+    def preview(self, message, width):
+        """Split a message into the preview lines shown on its card"""
+        key = (message, width)
+        cached = self.preview_cache.get(key)
+        if cached is not None:
+            return cached
+
+        message = message.strip("\n")
+        layout = QTextLayout(message.replace("\n", "\u2028"),
+                             self.message_font)
+        option = QTextOption()
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        layout.setTextOption(option)
+        lines = []
+        layout.beginLayout()
+        while len(lines) < self.PREVIEW_LINES - 1:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(width)
+            start = line.textStart()
+            lines.append(message[start:start + line.textLength()].rstrip())
+        else:
+            line = layout.createLine()
+            if line.isValid():
+                last, newline, rest = message[line.textStart():].partition(
+                    "\n")
+                if newline and rest.strip():
+                    last += "…"
+                lines.append(self.message_metrics.elidedText(
+                    last, Qt.ElideRight, width))
+        layout.endLayout()
+
+        lines = tuple(lines) or ("",)
+        if len(self.preview_cache) > 4096:
+            self.preview_cache.clear()
+        self.preview_cache[key] = lines
+        return lines
+
+    def sizeHint(self, option, index):
+        height = (2 * self.PADDING_Y + self.header_height +
+                  self.HEADER_SPACING +
+                  self.PREVIEW_LINES * self.message_metrics.lineSpacing())
+        return QSize(self.view.viewport().width(),
+                     max(self.ROW_HEIGHT, height) + self.SPACING)
+
+    SHADOW_BLUR = 15
+    SHADOW_OFFSET = 3
+
+    def card_rect(self, row_rect):
+        """Rect of the rounded card painted inside a row"""
+        return QRectF(row_rect.adjusted(
+            5, self.SPACING // 2, -5, -self.SPACING // 2)).adjusted(2, 2, -2, -2)
+
+    def paint_shadow(self, painter, row_rect):
+        """Paint a card's shadow; the view does this below all the cards"""
+        draw_shadow(painter, self.card_rect(row_rect), radius=10,
+                    blur=self.SHADOW_BLUR, offset=(0, self.SHADOW_OFFSET),
+                    color=QColor(107, 91, 149, 80))
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        card = self.card_rect(option.rect)
+        rect = card.adjusted(-2, -2, 2, 2)
+        path = QPainterPath()
+        path.addRoundedRect(card, 10, 10)
+
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomLeft())
+        if option.state & QStyle.State_MouseOver:
+            gradient.setColorAt(0, QColor(240, 230, 255))
+            gradient.setColorAt(1, QColor(235, 214, 255))
+        else:
+            gradient.setColorAt(0, QColor(250, 240, 255))
+            gradient.setColorAt(1, QColor(245, 235, 255))
+        painter.fillPath(path, gradient)
+        painter.setPen(QColor(177, 156, 217, 100))
+        painter.drawPath(path)
+
+        content = rect.toRect().adjusted(
+            self.PADDING_X, self.PADDING_Y, -self.PADDING_X, -self.PADDING_Y)
+        header = QRect(content.left(), content.top(),
+                       content.width(), self.header_height)
+
+        painter.setPen(QColor("#9370DB"))
+        painter.setFont(self.time_font)
+        time_width = painter.fontMetrics().horizontalAdvance(
+            index.data(ChatListModel.TimeRole))
+        painter.drawText(header, Qt.AlignRight | Qt.AlignVCenter,
+                         index.data(ChatListModel.TimeRole))
+
+        painter.setPen(QColor("#4B0082"))
+        painter.setFont(self.username_font)
+        painter.drawText(header.adjusted(0, 0, -time_width - 10, 0),
+                         Qt.AlignLeft | Qt.AlignVCenter,
+                         index.data(ChatListModel.UsernameRole))
+
+        painter.setPen(QColor("#6A5ACD"))
+        painter.setFont(self.message_font)
+        line_height = self.message_metrics.lineSpacing()
+        line = QRect(content.left(),
+                     content.top() + self.header_height + self.HEADER_SPACING,
+                     content.width(), line_height)
+        for text in self.preview(index.data(Qt.DisplayRole),
+                                 self.preview_width(option.rect.width())):
+            painter.drawText(line, Qt.AlignLeft | Qt.AlignVCenter, text)
+            line.translate(0, line_height)
+        painter.restore()
+
+
+class ChatListView(QListView):
+    """Virtualized list of conversations; emits the clicked username"""
+    chat_clicked = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.chat_model = ChatListModel(self)
+        self.setModel(self.chat_model)
+        self.setItemDelegate(ChatListDelegate(self))
+
+        self.setUniformItemSizes(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.viewport().setAutoFillBackground(False)
+        self.setObjectName("ChatList")
+        self.clicked.connect(self.emit_chat_clicked)
+
+    def paintEvent(self, event):
+        """Paint the shadows of the rows near the dirty area, then the rows.
+
+        Shadows reach into neighbouring rows, so they are drawn here in one
+        pass under every card instead of by each row, which keeps them
+        intact when a single row repaints.
+        """
+        delegate = self.itemDelegate()
+        rows = self.chat_model.rowCount()
+        if rows:
+            reach = delegate.SHADOW_BLUR + delegate.SHADOW_OFFSET
+            area = event.rect()
+            first = self.indexAt(QPoint(area.left(), area.top() - reach))
+            last = self.indexAt(QPoint(area.left(), area.bottom() + reach))
+            first_row = first.row() if first.isValid() else 0
+            last_row = last.row() if last.isValid() else rows - 1
+            painter = QPainter(self.viewport())
+            painter.setRenderHint(QPainter.Antialiasing)
+            for row in range(first_row, last_row + 1):
+                delegate.paint_shadow(
+                    painter, self.visualRect(self.chat_model.index(row)))
+            painter.end()
+        super().paintEvent(event)
+
+    def emit_chat_clicked(self, index):
+        """Forward a click on a row as the conversation's username"""
+        self.chat_clicked.emit(index.data(ChatListModel.UsernameRole))
+
+    def set_chats(self, rows):
+        """Show (key, username, message, time) rows, reusing unchanged ones"""
+        self.chat_model.set_chats(rows)
+
+    def clear_chats(self):
+        """Remove every conversation"""
+        self.chat_model.clear()
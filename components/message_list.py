@@ -0,0 +1,301 @@
+import sys
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt5.QtGui import QFont, QFontMetrics, QPainter, QPainterPath, QColor, QLinearGradient
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex,
+                          QRect, QRectF, QSize)
+from components.shadow import draw_shadow
+
+
+class MessageListModel(QAbstractListModel):
+    """Chat messages as plain rows of [username, message, time, is_own, key].
+
+    Rows hold only strings, so a long history costs a few objects per
+    message instead of a tree of widgets. key is the message's server
+    identity, used to reload history once the row has been evicted; rows
+    may be given without it, as for system notices.
+    """
+    UsernameRole = Qt.UserRole + 1
+    TimeRole = Qt.UserRole + 2
+    OwnRole = Qt.UserRole + 3
+    KeyRole = Qt.UserRole + 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.messages = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        username, message, time, is_own_message, key = self.messages[
+            index.row()]
+        if role == Qt.DisplayRole:
+            return message
+        if role == self.UsernameRole:
+            return username
+        if role == self.TimeRole:
+            return time
+        if role == self.OwnRole:
+            return is_own_message
+        if role == self.KeyRole:
+            return key
+        return None
+
+    @staticmethod
+    def make_row(row):
+        """Turn a 4- or 5-field tuple into a stored row"""
+        row = list(row)
+        if len(row) < 5:
+            row.append(None)
+        return row
+
+    def append_messages(self, rows):
+        """Add (username, message, time, is_own[, key]) rows at the bottom"""
+        if not rows:
+            return
+        start = len(self.messages)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self.messages.extend(self.make_row(row) for row in rows)
+        self.endInsertRows()
+
+    def prepend_messages(self, rows):
+        """Add (username, message, time, is_own[, key]) rows at the top"""
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self.messages[:0] = [self.make_row(row) for row in rows]
+        self.endInsertRows()
+
+    def remove_first(self, count):
+        """Remove the `count` oldest rows and return them"""
+        count = min(count, len(self.messages))
+        if count <= 0:
+            return []
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        removed = self.messages[:count]
+        del self.messages[:count]
+        self.endRemoveRows()
+        return removed
+
+    def first_key(self):
+        """Identity of the oldest row that has one, or None"""
+        for row in self.messages:
+            if row[4] is not None:
+                return row[4]
+        return None
+
+    def set_time(self, index, time):
+        """Change the time shown on a message"""
+        if not index.isValid():
+            return
+        self.messages[index.row()][2] = time
+        model_index = self.index(index.row())
+        self.dataChanged.emit(model_index, model_index, [self.TimeRole])
+
+    def set_key(self, index, key):
+        """Record the server identity of a message once it is known"""
+        if index.isValid():
+            self.messages[index.row()][4] = key
+
+    def memory_usage(self):
+        """Approximate bytes held by the rows"""
+        total = sys.getsizeof(self.messages)
+        for row in self.messages:
+            total += sys.getsizeof(row) + sum(map(sys.getsizeof, row[:3]))
+            if row[4] is not None:
+                total += sys.getsizeof(row[4]) + sum(
+                    map(sys.getsizeof, row[4]))
+        return total
+
+    def clear(self):
+        """Remove every message"""
+        self.beginResetModel()
+        self.messages = []
+        self.endResetModel()
+
+
+class MessageDelegate(QStyledItemDelegate):
+    """Paints chat bubbles without creating a widget per message"""
+    OUTER_MARGIN = 15
+    PADDING_X = 12
+    PADDING_Y = 8
+    SPACING = 4
+    MIN_HEIGHT = 60
+    MAX_WIDTH_RATIO = 0.75
+    ROW_PADDING = 10
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.username_font = QFont("Segoe UI", 10, QFont.Bold)
+        self.time_font = QFont("Segoe UI", 9)
+        self.message_font = QFont("Segoe UI", 11)
+        self.username_metrics = QFontMetrics(self.username_font)
+        self.time_metrics = QFontMetrics(self.time_font)
+        self.message_metrics = QFontMetrics(self.message_font)
+        self.size_cache = {}
+
+    def layout(self, index, width):
+        """Return the bubble size and message text rect for a row"""
+        username = index.data(MessageListModel.UsernameRole)
+        message = index.data(Qt.DisplayRole)
+        time = index.data(MessageListModel.TimeRole)
+        key = (username, message, time, width)
+        cached = self.size_cache.get(key)
+        if cached is not None:
+            return cached
+
+        max_bubble = max(int((width - 2 * self.OUTER_MARGIN) *
+                             self.MAX_WIDTH_RATIO), 4 * self.PADDING_X)
+        max_text = max_bubble - 2 * self.PADDING_X
+        header_width = (self.username_metrics.horizontalAdvance(username) +
+                        self.time_metrics.horizontalAdvance(time) + 8)
+        text_rect = self.message_metrics.boundingRect(
+            QRect(0, 0, max_text, 1 << 20),
+            Qt.TextWordWrap | Qt.AlignLeft, message)
+        header_height = max(self.username_metrics.height(),
+                            self.time_metrics.height())
+
+        bubble_width = min(max(text_rect.width(), header_width),
+                           max_text) + 2 * self.PADDING_X
+        bubble_height = max(header_height + self.SPACING + text_rect.height()
+                            + 2 * self.PADDING_Y, self.MIN_HEIGHT)
+        result = (QSize(bubble_width, bubble_height), header_height)
+        if len(self.size_cache) > 4096:
+            self.size_cache.clear()
+        self.size_cache[key] = result
+        return result
+
+    def forget(self, rows):
+        """Drop the cached layouts of rows that left the model"""
+        gone = {tuple(row[:3]) for row in rows}
+        self.size_cache = {key: size for key, size in self.size_cache.items()
+                           if key[:3] not in gone}
+
+    def memory_usage(self):
+        """Approximate bytes held by the layout cache"""
+        return sys.getsizeof(self.size_cache) + len(self.size_cache) * (
+            sys.getsizeof((None,) * 4) + sys.getsizeof((None,) * 2))
+
+    def sizeHint(self, option, index):
+        width = self.view.viewport().width()
+        bubble, _ = self.layout(index, width)
+        return QSize(width, bubble.height() + 2 * self.ROW_PADDING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRect(option.rect)
+
+        is_own_message = index.data(MessageListModel.OwnRole)
+        row = option.rect
+        bubble, header_height = self.layout(index, row.width())
+        if is_own_message:
+            left = row.right() - self.OUTER_MARGIN - bubble.width()
+        else:
+            left = row.left() + self.OUTER_MARGIN
+        rect = QRectF(left, row.top() + self.ROW_PADDING,
+                      bubble.width(), bubble.height())
+
+        path = QPainterPath()
+        path.addRoundedRect(rect.adjusted(2, 2, -2, -2), 10, 10)
+
+        draw_shadow(painter, rect.adjusted(2, 2, -2, -2), radius=10, blur=8,
+                    offset=(0, 2), color=QColor(107, 91, 149, 60))
+
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomLeft())
+        if is_own_message:
+            gradient.setColorAt(0, QColor(230, 230, 250))
+            gradient.setColorAt(1, QColor(216, 191, 216))
+            painter.setPen(QColor(177, 156, 217, 120))
+        else:
+            gradient.setColorAt(0, QColor(255, 255, 255))
+            gradient.setColorAt(1, QColor(245, 240, 255))
+            painter.setPen(QColor(200, 200, 220, 100))
+        painter.fillPath(path, gradient)
+        painter.drawPath(path)
+
+        content = rect.toRect().adjusted(
+            self.PADDING_X, self.PADDING_Y, -self.PADDING_X, -self.PADDING_Y)
+        header = QRect(content.left(), content.top(),
+                       content.width(), header_height)
+
+        painter.setPen(QColor("#4B0082"))
+        painter.setFont(self.username_font)
+        painter.drawText(header, Qt.AlignLeft | Qt.AlignVCenter,
+                         index.data(MessageListModel.UsernameRole))
+
+        painter.setPen(QColor("#6A5ACD"))
+        painter.setFont(self.time_font)
+        painter.drawText(header, Qt.AlignRight | Qt.AlignVCenter,
+                         index.data(MessageListModel.TimeRole))
+
+        painter.setPen(QColor("#4B0082"))
+        painter.setFont(self.message_font)
+        body = content.adjusted(0, header_height + self.SPACING, 0, 0)
+        painter.drawText(body, Qt.TextWordWrap | Qt.AlignLeft | Qt.AlignTop,
+                         index.data(Qt.DisplayRole))
+        painter.restore()
+
+
+class MessageListView(QListView):
+    """Virtualized chat history: only the visible bubbles are painted"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.message_model = MessageListModel(self)
+        self.setModel(self.message_model)
+        self.setItemDelegate(MessageDelegate(self))
+
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(False)
+        self.setSpacing(0)
+        self.viewport().setAutoFillBackground(False)
+        self.setObjectName("MessageList")
+
+    def add_message(self, username, message, time, is_own_message, key=None):
+        """Append a message, returning a handle for later time updates"""
+        self.message_model.append_messages(
+            [(username, message, time, is_own_message, key)])
+        return QPersistentModelIndex(
+            self.message_model.index(self.message_model.rowCount() - 1))
+
+    def add_messages(self, rows):
+        """Append (username, message, time, is_own[, key]) rows"""
+        self.message_model.append_messages(rows)
+
+    def prepend_messages(self, rows):
+        """Insert (username, message, time, is_own[, key]) rows on top"""
+        self.message_model.prepend_messages(rows)
+
+    def set_time(self, handle, time):
+        """Change the time shown on the message behind a handle"""
+        self.message_model.set_time(handle, time)
+
+    def set_key(self, handle, key):
+        """Record the server identity of the message behind a handle"""
+        self.message_model.set_key(handle, key)
+
+    def evict_oldest(self, count):
+        """Drop the `count` oldest messages.
+
+        Returns the identity of the oldest message left, which is the
+        anchor for reloading the evicted ones.
+        """
+        self.itemDelegate().forget(self.message_model.remove_first(count))
+        return self.message_model.first_key()
+
+    def memory_usage(self):
+        """Approximate bytes held for the messages and their layouts"""
+        return (self.message_model.memory_usage() +
+                self.itemDelegate().memory_usage())
+
+    def clear_messages(self):
+        """Remove every message"""
+        self.message_model.clear()
@@ -0,0 +1,72 @@
+from functools import lru_cache
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect
+from PyQt5.QtGui import QColor, QImage, QPainter, QPainterPath, QPixmap
+from PyQt5.QtCore import Qt, QRectF
+
+
+@lru_cache(maxsize=32)
+def shadow_pixmap(radius, blur, rgba):
+    """Blurred rounded-rect shadow, small enough to stretch as a nine-patch.
+
+    The shape is a rounded rect with a one pixel flat middle; the corner
+    slices are radius + 2 * blur wide, which covers both the rounded
+    corner and the reach of the blur, so the middle row and column can
+    be stretched to any size without changing the shadow's profile.
+    """
+    corner = radius + 2 * blur
+    size = 2 * corner + 1
+
+    shape = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    shape.fill(Qt.transparent)
+    painter = QPainter(shape)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(blur, blur, size - 2 * blur, size - 2 * blur),
+                        radius, radius)
+    painter.fillPath(path, QColor.fromRgba(rgba))
+    painter.end()
+
+    # Same blur as QGraphicsDropShadowEffect, but computed only once.
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(shape))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+
+    blurred = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    blurred.fill(Qt.transparent)
+    painter = QPainter(blurred)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(0, 0, size, size))
+    painter.end()
+    return QPixmap.fromImage(blurred), corner
+
+
+def draw_shadow(painter, rect, radius=10, blur=8, offset=(0, 2),
+                color=QColor(107, 91, 149, 60)):
+    """Paint the drop shadow of a rounded rect from the cached nine-patch"""
+    pixmap, corner = shadow_pixmap(radius, blur, color.rgba())
+    target = QRectF(rect).translated(*offset).adjusted(
+        -blur, -blur, blur, blur)
+    size = pixmap.width()
+
+    # Shrink the corners on targets smaller than two of them.
+    corner_x = min(corner, target.width() / 2)
+    corner_y = min(corner, target.height() / 2)
+    source_x = (0, corner, size - corner, size)
+    source_y = (0, corner, size - corner, size)
+    target_x = (target.left(), target.left() + corner_x,
+                target.right() - corner_x, target.right())
+    target_y = (target.top(), target.top() + corner_y,
+                target.bottom() - corner_y, target.bottom())
+
+    for row in range(3):
+        for column in range(3):
+            painter.drawPixmap(
+                QRectF(target_x[column], target_y[row],
+                       target_x[column + 1] - target_x[column],
+                       target_y[row + 1] - target_y[row]),
+                pixmap,
+                QRectF(source_x[column], source_y[row],
+                       source_x[column + 1] - source_x[column],
+                       source_y[row + 1] - source_y[row]))
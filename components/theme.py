@@ -0,0 +1,198 @@
+from PyQt5.QtWidgets import QApplication
+
+
+# One stylesheet for the whole application, parsed once at start-up.
+# Widgets are matched by object name and by two dynamic properties:
+# "role" says what a widget is and never changes, "state" is flipped at
+# runtime with set_state() instead of assigning a new stylesheet.
+STYLESHEET = """
+QWidget#CentralWidget {
+    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+        stop: 0 #E6E6FA, stop: 1 #D8BFD8);
+    border-radius: 16px;
+    border: 1px solid #B19CD9;
+}
+QWidget#TitleBar {
+    background: transparent;
+}
+QLabel#WindowTitle {
+    color: #4B0082;
+    font-weight: bold;
+    font-size: 18px;
+    background: transparent;
+    padding: 4px;
+}
+QStackedWidget#ViewStack {
+    background: rgba(255, 255, 255, 0.7);
+    border-radius: 12px;
+    border: 1px solid rgba(177, 156, 217, 0.5);
+}
+
+QLabel {
+    background: transparent;
+}
+QLabel[role="title"] {
+    color: #4B0082;
+    padding: 5px;
+    margin-bottom: 10px;
+}
+QLabel[role="primary"] {
+    color: #4B0082;
+}
+QLabel[role="secondary"] {
+    color: #6A5ACD;
+}
+QLabel[role="subtitle"] {
+    color: #6A5ACD;
+    margin-bottom: 15px;
+}
+QLabel[role="hint"] {
+    color: #9370DB;
+}
+QLabel[role="decoration"] {
+    color: #B19CD9;
+    margin-top: 10px;
+}
+QLabel[role="link"] {
+    margin-top: 15px;
+}
+QLabel[role="status"] {
+    color: #FF4500;
+}
+QLabel[role="status"][state="pending"] {
+    color: #FFD93D;
+}
+QLabel[role="status"][state="success"] {
+    color: #2E8B57;
+}
+QLabel[role="notice"] {
+    color: #FF4500;
+    padding: 8px;
+    border-radius: 6px;
+    background-color: rgba(255, 69, 0, 0.1);
+}
+QLabel[role="notice"][state="success"] {
+    color: #2E8B57;
+    background-color: rgba(46, 139, 87, 0.1);
+}
+
+QWidget#Card {
+    background: rgba(255, 255, 255, 0.7);
+    border-radius: 12px;
+    border: 1px solid rgba(177, 156, 217, 0.3);
+}
+
+QLineEdit, QTextEdit {
+    background: #FFFFFF;
+    color: #4B0082;
+    padding: 8px 12px;
+    border: none;
+    border-radius: 10px;
+    selection-background-color: #D8BFD8;
+}
+QTextEdit {
+    padding: 0px;
+}
+
+#LoginWindow QLabel[role="subtitle"] {
+    color: #9370DB;
+}
+#LoginWindow QLabel[role="secondary"] {
+    color: #FF69B4;
+}
+#LoginWindow QWidget#Card {
+    border-color: rgba(255, 182, 193, 0.3);
+}
+#LoginWindow QLineEdit {
+    selection-background-color: #FFB6C1;
+}
+#HomeWindow QWidget#Card {
+    background: rgba(255, 255, 255, 0.6);
+    border-radius: 16px;
+}
+#HomeWindow QLabel[role="decoration"] {
+    margin-top: 20px;
+}
+#Profile QWidget#Card {
+    border-radius: 16px;
+}
+QLabel#UsernameDisplay {
+    color: #4B0082;
+    background: rgba(255, 255, 255, 0.8);
+    border-radius: 8px;
+    padding: 10px;
+    border: 1px solid rgba(177, 156, 217, 0.2);
+}
+
+QWidget#ChatHeader {
+    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+        stop: 0 #7B68EE, stop: 1 #6A5ACD);
+    border-bottom: 1px solid #5C4AA8;
+}
+QLabel#ChatTitle {
+    color: #FFFFFF;
+}
+QLabel#ConnectionStatus, QLabel#ConnectionStatus[state="connected"] {
+    color: #4ECDC4;
+}
+QLabel#ConnectionStatus[state="connecting"] {
+    color: #FFD93D;
+}
+QLabel#ConnectionStatus[state="disconnected"] {
+    color: #FF6B6B;
+}
+QLabel#MemoryGauge {
+    color: rgba(255, 255, 255, 0.8);
+    padding-right: 8px;
+}
+QWidget#ChatInputBar {
+    background: rgba(255, 255, 255, 0.8);
+    border-top: 1px solid rgba(177, 156, 217, 0.3);
+}
+
+QListView#MessageList, QListView#ChatList {
+    border: none;
+    background: transparent;
+}
+QListView#MessageList {
+    padding-top: 10px;
+    padding-bottom: 10px;
+}
+QListView#MessageList QScrollBar:vertical,
+QListView#ChatList QScrollBar:vertical {
+    border: none;
+    background: rgba(177, 156, 217, 0.3);
+    width: 8px;
+    margin: 0px;
+}
+QListView#MessageList QScrollBar::handle:vertical,
+QListView#ChatList QScrollBar::handle:vertical {
+    background: rgba(107, 91, 149, 0.5);
+    border-radius: 4px;
+    min-height: 20px;
+}
+QListView#MessageList QScrollBar::handle:vertical:hover,
+QListView#ChatList QScrollBar::handle:vertical:hover {
+    background: rgba(107, 91, 149, 0.7);
+}
+"""
+
+
+def apply_theme(app=None):
+    """Install the application stylesheet; call before building widgets"""
+    (app or QApplication.instance()).setStyleSheet(STYLESHEET)
+
+
+def set_role(widget, role):
+    """Give a widget its fixed style role; use before it is first shown"""
+    widget.setProperty("role", role)
+
+
+def set_state(widget, state):
+    """Switch a widget's style state and repolish only that widget"""
+    if widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
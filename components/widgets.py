@@ -0,0 +1,192 @@
+from PyQt5.QtWidgets import QLineEdit, QTextEdit, QPushButton
+from PyQt5.QtGui import QFont, QPainter, QPainterPath, QLinearGradient, QColor, QBrush, QPen
+from PyQt5.QtCore import Qt, QRectF
+
+
+# Button colour schemes shared by the views.
+PURPLE = {
+    "normal_top": "#7B68EE",
+    "normal_bottom": "#6A5ACD",
+    "hover_top": "#9370DB",
+    "hover_bottom": "#7B68EE",
+    "text": "#FFFFFF"
+}
+PINK = {
+    "normal_top": "#FF69B4",
+    "normal_bottom": "#FF1493",
+    "hover_top": "#FFB6C1",
+    "hover_bottom": "#FF69B4",
+    "text": "#FFFFFF"
+}
+VIOLET = {
+    "normal_top": "#9370DB",
+    "normal_bottom": "#7B68EE",
+    "hover_top": "#A891D6",
+    "hover_bottom": "#9370DB",
+    "text": "#FFFFFF"
+}
+INDIGO = {
+    "normal_top": "#6A5ACD",
+    "normal_bottom": "#5C4AA8",
+    "hover_top": "#7B68EE",
+    "hover_bottom": "#6A5ACD",
+    "text": "#FFFFFF"
+}
+LILAC = {
+    "normal_top": "#D8BFD8",
+    "normal_bottom": "#C7A4C7",
+    "hover_top": "#E6E6FA",
+    "hover_bottom": "#D8BFD8",
+    "text": "#4B0082"
+}
+# Flat colours for the small title bar buttons.
+TITLE_BAR = {
+    "normal_top": "#6B5B95",
+    "normal_bottom": "#6B5B95",
+    "hover_top": "#5E4B8B",
+    "hover_bottom": "#5E4B8B",
+    "disabled_top": "#D3D3D3",
+    "disabled_bottom": "#D3D3D3",
+    "text": "#FFFFFF"
+}
+
+# Input border colours, unfocused and focused.
+LAVENDER_BORDER = ("#D8BFD8", "#7B68EE")
+PINK_BORDER = ("#FFB6C1", "#FF69B4")
+
+
+def rounded_path(width, height, radius, inset):
+    """Rounded rect path inset from a widget's edges"""
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(inset, inset, width - 2 * inset,
+                               height - 2 * inset), radius, radius)
+    return path
+
+
+class RoundedLineEdit(QLineEdit):
+    """Line edit with a rounded border that highlights on focus"""
+
+    def __init__(self, placeholder="", parent=None, radius=12,
+                 border=LAVENDER_BORDER, font_size=11, min_width=0):
+        super().__init__(parent)
+        self.radius = radius
+        self.pens = (QPen(QColor(border[0])), QPen(QColor(border[1])))
+        self.path = None
+        self.setMinimumSize(min_width, 44)
+        self.setFont(QFont("Segoe UI", font_size))
+        self.setPlaceholderText(placeholder)
+
+    def resizeEvent(self, event):
+        self.path = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+        if self.path is None:
+            self.path = rounded_path(self.width(), self.height(),
+                                     self.radius, 0.5)
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.pens[self.hasFocus()])
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.path)
+
+
+class RoundedTextEdit(QTextEdit):
+    """Multi-line counterpart of RoundedLineEdit.
+
+    A QTextEdit paints on its viewport, so the border is drawn there too.
+    """
+
+    def __init__(self, placeholder="", parent=None, radius=10,
+                 border=LAVENDER_BORDER, font_size=11):
+        super().__init__(parent)
+        self.radius = radius
+        self.pens = (QPen(QColor(border[0])), QPen(QColor(border[1])))
+        self.path = None
+        self.setMinimumSize(240, 100)
+        self.setFont(QFont("Segoe UI", font_size))
+        self.setPlaceholderText(placeholder)
+        self.document().setDocumentMargin(10)
+
+    def resizeEvent(self, event):
+        self.path = None
+        super().resizeEvent(event)
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.viewport().update()
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+        viewport = self.viewport()
+        if self.path is None:
+            self.path = rounded_path(viewport.width(), viewport.height(),
+                                     self.radius, 0.5)
+        painter = QPainter(viewport)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.pens[self.hasFocus()])
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.path)
+
+
+class GradientButton(QPushButton):
+    """Push button painted as a rounded rect with a vertical gradient.
+
+    The path is built once per size and each state's gradient once per
+    height, so hovering only swaps a cached brush; both are dropped on
+    resize.
+    """
+
+    def __init__(self, text, color_scheme, parent=None, radius=12,
+                 size=(140, 48), font_size=12):
+        super().__init__(text, parent)
+        self.color_scheme = color_scheme
+        self.radius = radius
+        self.text_color = QColor(color_scheme["text"])
+        self.path = None
+        self.brushes = {}
+        self.setCursor(Qt.PointingHandCursor)
+        self.setMinimumSize(*size)
+        self.setFont(QFont("Segoe UI", font_size, QFont.Bold))
+
+    def state(self):
+        """Which colours to paint with: normal, hover or disabled"""
+        if not self.isEnabled():
+            return "disabled"
+        return "hover" if self.underMouse() else "normal"
+
+    def brush(self, state):
+        """Return the cached gradient brush for a state"""
+        brush = self.brushes.get(state)
+        if brush is None:
+            gradient = QLinearGradient(0, 0, 0, self.height())
+            gradient.setColorAt(0, QColor(self.color_scheme.get(
+                f"{state}_top", "#D3D3D3")))
+            gradient.setColorAt(1, QColor(self.color_scheme.get(
+                f"{state}_bottom", "#C0C0C0")))
+            brush = self.brushes[state] = QBrush(gradient)
+        return brush
+
+    def resizeEvent(self, event):
+        self.path = None
+        self.brushes.clear()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self.path is None:
+            self.path = rounded_path(self.width(), self.height(),
+                                     self.radius, 2)
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillPath(self.path, self.brush(self.state()))
+
+        painter.setPen(self.text_color)
+        painter.setFont(self.font())
+        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
@@ -25,3 +25,26 @@ if SECRET_KEY is None:
 if INIT_VECTOR is None:
     raise ValueError(
         "INIT_VECTOR environment variable is not set in .env file")
+
+# Messages fetched, decoded and shown per page of chat history.
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "50"))
+
+# Messages a chat window keeps in memory; older ones are reloaded on scroll.
+MESSAGE_WINDOW_SIZE = int(os.getenv("MESSAGE_WINDOW_SIZE", "500"))
+SHOW_MEMORY_GAUGE = os.getenv("SHOW_MEMORY_GAUGE", "0") == "1"
+
+# Screens are built on first use; the likely next one is built once idle.
+PREFETCH_VIEWS = os.getenv("PREFETCH_VIEWS", "1") == "1"
+PREFETCH_DELAY_MS = int(os.getenv("PREFETCH_DELAY_MS", "300"))
+
+# Local message cache; ":memory:" keeps it for the current run only.
+MESSAGE_STORE_PATH = os.getenv(
+    "MESSAGE_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".chat-client", "messages.db"))
+
+# REST timeouts in seconds: (connect, read).
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "4"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "8"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
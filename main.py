@@ -1,42 +1,32 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QLabel, QSizePolicy
-from PyQt5.QtGui import QFont, QLinearGradient, QPalette, QColor, QPainter, QPainterPath
-from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect
-from views.menu import MenuWindow
-from views.signup import SignupWindow
-from views.login import LoginWindow
-from views.home import HomeWindow
-from views.new_chat import NewChatWindow
-from views.chat_list import ChatList
-from views.profile import Profile
-
-
-class RoundedButton(QPushButton):
-    def __init__(self, text, parent=None):
-        super().__init__(text, parent)
-        self.setCursor(Qt.PointingHandCursor)
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        path = QPainterPath()
-        path.addRoundedRect(2, 2, self.width()-4, self.height()-4, 8, 8)
-
-        if self.isEnabled():
-            if self.underMouse():
-                painter.fillPath(path, QColor("#5E4B8B"))
-            else:
-                painter.fillPath(path, QColor("#6B5B95"))  # Medium purple
-        else:
-            painter.fillPath(path, QColor("#D3D3D3"))  # Gray when disabled
-
-        painter.setPen(Qt.white)
-        painter.setFont(self.font())
-        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+import importlib
+from utils.startup_profile import StartupProfile
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QVBoxLayout, QHBoxLayout, QWidget, QLabel, QSizePolicy
+from PyQt5.QtGui import QFont, QLinearGradient, QPalette
+from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QTimer
+from components.theme import apply_theme
+from components.widgets import GradientButton, TITLE_BAR
+from utils.api_client import ApiClient
+
+STARTUP_PROFILE_PATH = "startup_profile.txt"
 
 
 class MainWindow(QMainWindow):
+    # Screens are imported by name when first built, so start-up only pays
+    # for the menu and not for requests, cryptography or websocket.
+    VIEW_CLASSES = {
+        "menu": "views.menu:MenuWindow",
+        "signup": "views.signup:SignupWindow",
+        "login": "views.login:LoginWindow",
+        "home": "views.home:HomeWindow",
+        "new_chat": "views.new_chat:NewChatWindow",
+        "existing_chats": "views.chat_list:ChatList",
+        "profile": "views.profile:Profile",
+    }
+    VIEW_ORDER = ["menu", "signup", "login", "home",
+                  "new_chat", "existing_chats", "profile"]
+    NEXT_VIEWS = {"menu": "login", "signup": "login", "login": "home"}
+
     def __init__(self):
         super().__init__()
         self.username = ""
@@ -50,14 +40,6 @@ class MainWindow(QMainWindow):
 
         self.central_widget = QWidget()
         self.central_widget.setObjectName("CentralWidget")
-        self.central_widget.setStyleSheet("""
-            #CentralWidget {
-                background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                    stop: 0 #E6E6FA, stop: 1 #D8BFD8);
-                border-radius: 16px;
-                border: 1px solid #B19CD9;
-            }
-        """)
         self.setCentralWidget(self.central_widget)
 
         self.window_history = []
@@ -68,12 +50,12 @@ class MainWindow(QMainWindow):
 
         title_bar = QWidget()
         title_bar.setFixedHeight(40)
-        title_bar.setStyleSheet("background: transparent;")
+        title_bar.setObjectName("TitleBar")
         title_bar_layout = QHBoxLayout(title_bar)
         title_bar_layout.setContentsMargins(0, 0, 0, 0)
         title_bar_layout.setSpacing(8)
 
-        self.back_button = RoundedButton("←")
+        self.back_button = GradientButton("←", TITLE_BAR, radius=8)
         self.back_button.setFixedSize(32, 32)
         self.back_button.setFont(QFont("Segoe UI", 14, QFont.Bold))
         self.back_button.clicked.connect(self.go_back)
@@ -82,19 +64,11 @@ class MainWindow(QMainWindow):
 
         title_label = QLabel("Chat")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #4B0082;
-                font-weight: bold;
-                font-size: 18px;
-                background: transparent;
-                padding: 4px;
-            }
-        """)
+        title_label.setObjectName("WindowTitle")
         title_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
         title_bar_layout.addWidget(title_label, 1)
 
-        self.close_button = RoundedButton("✕")
+        self.close_button = GradientButton("✕", TITLE_BAR, radius=8)
         self.close_button.setFixedSize(32, 32)
         self.close_button.setFont(QFont("Segoe UI", 12, QFont.Bold))
         self.close_button.clicked.connect(self.close)
@@ -103,30 +77,9 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(title_bar)
 
         self.stacked_widget = QStackedWidget()
-        self.stacked_widget.setStyleSheet("""
-            QStackedWidget {
-                background: rgba(255, 255, 255, 0.7);
-                border-radius: 12px;
-                border: 1px solid rgba(177, 156, 217, 0.5);
-            }
-        """)
-
-        self.menu_window = MenuWindow(self)
-        self.signup_window = SignupWindow(self)
-        self.login_window = LoginWindow(self)
-        self.home_window = HomeWindow(self)
-        self.new_chat_window = NewChatWindow(self)
-        self.existing_chats_window = ChatList(self)
-        self.profile_window = Profile(self)
-
-        self.stacked_widget.addWidget(self.menu_window)
-        self.stacked_widget.addWidget(self.signup_window)
-        self.stacked_widget.addWidget(self.login_window)
-        self.stacked_widget.addWidget(self.home_window)
-        self.stacked_widget.addWidget(self.new_chat_window)
-        self.stacked_widget.addWidget(self.existing_chats_window)
-        self.stacked_widget.addWidget(self.profile_window)
+        self.stacked_widget.setObjectName("ViewStack")
 
+        self.views = {}
         self.stacked_widget.setCurrentWidget(self.menu_window)
         self.window_history.append(self.menu_window)
         self.stacked_widget.currentChanged.connect(self.update_history)
@@ -134,6 +87,67 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.stacked_widget)
 
         self.old_pos = None
+        # Wait for the first frame before building anything else.
+        QTimer.singleShot(0, self.prefetch_next_view)
+
+    def view(self, name):
+        """Return a screen, building it the first time it is needed"""
+        view = self.views.get(name)
+        if view is None:
+            profile = StartupProfile.instance()
+            module_name, class_name = self.VIEW_CLASSES[name].split(":")
+            with profile.measure(f"import {module_name}"):
+                view_class = getattr(
+                    importlib.import_module(module_name), class_name)
+            with profile.measure(f"build {name}"):
+                view = view_class(self)
+            self.views[name] = view
+            # Keep the stack in VIEW_ORDER so transitions slide the same way.
+            index = sum(1 for other in self.VIEW_ORDER[
+                :self.VIEW_ORDER.index(name)] if other in self.views)
+            self.stacked_widget.insertWidget(index, view)
+        return view
+
+    def prefetch_next_view(self):
+        """Build the screen the user is likely to open next once idle"""
+        from config.config import PREFETCH_VIEWS, PREFETCH_DELAY_MS
+        if not PREFETCH_VIEWS:
+            return
+        current = self.stacked_widget.currentWidget()
+        for name, view in self.views.items():
+            if view is current and name in self.NEXT_VIEWS:
+                next_name = self.NEXT_VIEWS[name]
+                QTimer.singleShot(PREFETCH_DELAY_MS,
+                                  lambda: self.view(next_name))
+                return
+
+    @property
+    def menu_window(self):
+        return self.view("menu")
+
+    @property
+    def signup_window(self):
+        return self.view("signup")
+
+    @property
+    def login_window(self):
+        return self.view("login")
+
+    @property
+    def home_window(self):
+        return self.view("home")
+
+    @property
+    def new_chat_window(self):
+        return self.view("new_chat")
+
+    @property
+    def existing_chats_window(self):
+        return self.view("existing_chats")
+
+    @property
+    def profile_window(self):
+        return self.view("profile")
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -202,13 +216,6 @@ class MainWindow(QMainWindow):
         new_index = self.stacked_widget.indexOf(new_window)
         direction = "left" if new_index > current_index else "right"
         self.stacked_widget.setCurrentWidget(new_window)
-        self.stacked_widget.setStyleSheet("""
-            QStackedWidget {
-                background: rgba(255, 255, 255, 0.7);
-                border-radius: 12px;
-                border: 1px solid rgba(177, 156, 217, 0.5);
-            }
-        """)
 
     def go_back(self):
         if len(self.window_history) > 1:
@@ -222,15 +229,51 @@ class MainWindow(QMainWindow):
         if not self.window_history or self.window_history[-1] != current_widget:
             self.window_history.append(current_widget)
         self.back_button.setEnabled(len(self.window_history) > 1)
+        self.prefetch_next_view()
+
+
+def startup_profile_path(argv):
+    """Pop --profile-startup[=path] from argv; return the report path"""
+    for arg in argv[1:]:
+        if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+            argv.remove(arg)
+            return arg.partition("=")[2] or STARTUP_PROFILE_PATH
+    return None
+
+
+def write_startup_profile(path):
+    """Save the startup report and print it"""
+    profile = StartupProfile.instance()
+    profile.write(path)
+    print(profile.report(), end="")
+    print(f"Startup profile written to {path}")
 
 
 if __name__ == "__main__":
+    profile = StartupProfile.instance()
+    profile_path = startup_profile_path(sys.argv)
+    if profile_path:
+        profile.enable()
+    profile.mark("imports")
+
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     font = QFont("Segoe UI", 10)
     app.setFont(font)
+    apply_theme(app)
+    profile.mark("QApplication")
+    app.aboutToQuit.connect(ApiClient.instance().shutdown)
     window = MainWindow()
+    profile.mark("MainWindow")
     window.show()
+    profile.mark("show")
+    if profile_path:
+        def first_frame():
+            profile.mark("first frame")
+            write_startup_profile(profile_path)
+        QTimer.singleShot(0, first_frame)
+        # Rewrite on exit to include screens and imports loaded later.
+        app.aboutToQuit.connect(lambda: write_startup_profile(profile_path))
     sys.exit(app.exec_())
@@ -0,0 +1,106 @@
+import time
+import unittest
+from utils.websocket_client import OutboundQueue, PendingAcks
+
+
+def frame(message_id):
+    return {"id": message_id, "message": message_id}
+
+
+class OutboundQueueTest(unittest.TestCase):
+    def test_batches_keep_order(self):
+        queue = OutboundQueue()
+        for message_id in "abc":
+            queue.put(frame(message_id))
+        self.assertEqual([f["id"] for f in queue.get_batch(2, 0)], ["a", "b"])
+        self.assertEqual([f["id"] for f in queue.get_batch(2, 0)], ["c"])
+        self.assertEqual(queue.get_batch(2, 0), [])
+
+    def test_requeue_goes_to_the_front(self):
+        queue = OutboundQueue()
+        queue.put(frame("c"))
+        queue.requeue([frame("a"), frame("b")])
+        self.assertEqual([f["id"] for f in queue.get_batch(5, 0)],
+                         ["a", "b", "c"])
+
+    def test_fail_policy_rejects_when_full(self):
+        queue = OutboundQueue(maxsize=1, policy=OutboundQueue.FAIL)
+        self.assertTrue(queue.put(frame("a")))
+        self.assertFalse(queue.put(frame("b")))
+        self.assertEqual(len(queue), 1)
+
+    def test_drop_oldest_policy(self):
+        queue = OutboundQueue(maxsize=2, policy=OutboundQueue.DROP_OLDEST)
+        for message_id in "abc":
+            queue.put(frame(message_id))
+        self.assertEqual(queue.dropped, 1)
+        self.assertEqual([f["id"] for f in queue.get_batch(5, 0)], ["b", "c"])
+
+    def test_block_policy_times_out(self):
+        queue = OutboundQueue(maxsize=1, policy=OutboundQueue.BLOCK,
+                              block_timeout=0.05)
+        queue.put(frame("a"))
+        self.assertFalse(queue.put(frame("b")))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            OutboundQueue(policy="spill")
+
+
+class PendingAcksTest(unittest.TestCase):
+    def expire(self, acks):
+        time.sleep(acks.timeout * 2)
+        return acks.expired()
+
+    def test_acknowledged_message_is_forgotten(self):
+        acks = PendingAcks(timeout=0.01)
+        self.assertTrue(acks.track(frame("a")))
+        self.assertTrue(acks.acknowledge("a"))
+        self.assertFalse(acks.acknowledge("a"))
+        self.assertEqual(self.expire(acks), ([], []))
+
+    def test_retries_are_bounded(self):
+        acks = PendingAcks(timeout=0.01, max_retries=2)
+        acks.track(frame("a"))
+        for _ in range(2):
+            retry, failed = self.expire(acks)
+            self.assertEqual(([f["id"] for f in retry], failed), (["a"], []))
+            self.assertTrue(acks.track(retry[0]))
+        self.assertEqual(self.expire(acks), ([], ["a"]))
+        self.assertEqual(len(acks), 0)
+
+    def test_failed_write_keeps_retry_count(self):
+        acks = PendingAcks(timeout=0.01, max_retries=1)
+        acks.track(frame("a"))
+        retry, _ = self.expire(acks)
+        acks.track(retry[0])
+        acks.untrack(retry[0])
+        acks.track(retry[0])
+        self.assertEqual(self.expire(acks), ([], ["a"]))
+
+    def test_failed_first_write_is_untracked(self):
+        acks = PendingAcks(timeout=0.01)
+        acks.track(frame("a"))
+        acks.untrack(frame("a"))
+        self.assertEqual(len(acks), 0)
+
+    def test_receipt_cancels_queued_resend(self):
+        acks = PendingAcks(timeout=0.01)
+        acks.track(frame("a"))
+        retry, _ = self.expire(acks)
+        self.assertTrue(acks.acknowledge("a"))
+        self.assertFalse(acks.track(retry[0]))
+        self.assertEqual(len(acks), 0)
+        self.assertTrue(acks.track(frame("a")))
+
+    def test_discard_forgets_message(self):
+        acks = PendingAcks(timeout=0.01)
+        acks.track(frame("a"))
+        retry, _ = self.expire(acks)
+        acks.discard("a")
+        self.assertEqual(len(acks), 0)
+        self.assertEqual(self.expire(acks), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
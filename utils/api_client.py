@@ -0,0 +1,143 @@
+import queue
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from config.config import HTTP_WORKERS
+from utils.http_client import HttpClient
+
+
+class ApiRequest(QObject):
+    """Handle for a REST call running in the background.
+
+    Results are delivered on the GUI thread through succeeded/failed, and
+    progress carries intermediate values reported by the parse callback.
+    Nothing is delivered once the request has been cancelled.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(object)
+
+    _succeeded = pyqtSignal(object)
+    _failed = pyqtSignal(object)
+    _progress = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.cancelled = False
+        self._succeeded.connect(self._deliver_success)
+        self._failed.connect(self._deliver_failure)
+        self._progress.connect(self._deliver_progress)
+
+    def cancel(self):
+        """Stop the request; a call already on the wire is left to finish"""
+        self.cancelled = True
+
+    def report(self, value):
+        """Send an intermediate result to the GUI thread (worker side)"""
+        if not self.cancelled:
+            self._progress.emit(value)
+
+    def _deliver_success(self, result):
+        if not self.cancelled:
+            self.succeeded.emit(result)
+
+    def _deliver_failure(self, error):
+        if not self.cancelled:
+            self.failed.emit(error)
+
+    def _deliver_progress(self, value):
+        if not self.cancelled:
+            self.progress.emit(value)
+
+
+class ApiClient:
+    """Runs REST calls against SERVER on a shared worker pool.
+
+    Workers are daemon threads, like the WebSocket client's, so a call
+    still on the wire when the app quits cannot keep the process alive.
+    """
+    _instance = None
+
+    def __init__(self, workers=HTTP_WORKERS):
+        self.max_workers = workers
+        self.workers = []
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.closed = False
+
+    @property
+    def http(self):
+        """The shared HTTP client, created by the first request's worker"""
+        return HttpClient.instance()
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide API client"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, path, params=None, parse=None):
+        """Start a GET request"""
+        return self.request("GET", path, parse, params=params)
+
+    def post(self, path, json=None, parse=None):
+        """Start a POST request with a JSON body"""
+        return self.request("POST", path, parse, json=json)
+
+    def put(self, path, params=None, parse=None):
+        """Start a PUT request"""
+        return self.request("PUT", path, parse, params=params)
+
+    def request(self, method, path, parse=None, **kwargs):
+        """Start a request and return its ApiRequest handle.
+
+        parse(response, request), if given, runs on the worker thread and
+        its return value is delivered instead of the raw response. It may
+        call request.report() to stream partial results.
+        """
+        api_request = ApiRequest()
+        with self.lock:
+            if self.closed:
+                api_request.cancelled = True
+                return api_request
+            self.queue.put((api_request, method, path, parse, kwargs))
+            if len(self.workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._work, daemon=True,
+                    name=f"api_{len(self.workers)}")
+                self.workers.append(worker)
+                worker.start()
+        return api_request
+
+    def shutdown(self):
+        """Drop queued requests and stop the workers; called on quit.
+
+        Calls already on the wire are not waited for.
+        """
+        with self.lock:
+            self.closed = True
+            while True:
+                try:
+                    self.queue.get_nowait()[0].cancelled = True
+                except queue.Empty:
+                    break
+            for _ in self.workers:
+                self.queue.put(None)
+
+    def _work(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            self._run(*job)
+
+    def _run(self, api_request, method, path, parse, kwargs):
+        if api_request.cancelled:
+            return
+        try:
+            response = self.http.request(method, path, **kwargs)
+            result = parse(response, api_request) if parse else response
+        except Exception as e:
+            api_request._failed.emit(e)
+            return
+        api_request._succeeded.emit(result)
@@ -1,50 +1,42 @@
 import base64
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+import threading
 import zlib
+from collections import OrderedDict
 from config.config import SECRET_KEY, INIT_VECTOR
+from utils.startup_profile import StartupProfile
 
 
-def encrypt(value: str) -> str:
-    try:
-        if not SECRET_KEY or not INIT_VECTOR:
+class AESCodec:
+    """AES-CBC codec that prepares the key material once and reuses it"""
+
+    def __init__(self, secret_key, init_vector):
+        if not secret_key or not init_vector:
             raise ValueError("Secret key or init vector not initialized")
 
-        iv = INIT_VECTOR.encode('utf-8')
-        key = SECRET_KEY.encode('utf-8')
+        # cryptography is loaded with the first codec, not at app start.
+        with StartupProfile.instance().measure("import cryptography"):
+            from cryptography.hazmat.primitives.ciphers import (
+                Cipher, algorithms, modes)
+            from cryptography.hazmat.backends import default_backend
 
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.CBC(iv),
+        self.cipher = Cipher(
+            algorithms.AES(secret_key.encode('utf-8')),
+            modes.CBC(init_vector.encode('utf-8')),
             backend=default_backend()
         )
-        encryptor = cipher.encryptor()
-
-        padding_length = 16 - (len(value) % 16)
-        padded_value = value + chr(padding_length) * padding_length
-
-        encrypted = encryptor.update(
-            padded_value.encode('utf-8')) + encryptor.finalize()
-        return base64.b64encode(encrypted).decode('utf-8')
-
-    except Exception as ex:
-        raise RuntimeError(f"Encryption error: {str(ex)}") from ex
 
+    def encrypt(self, value: str) -> str:
+        encryptor = self.cipher.encryptor()
 
-def decrypt(encrypted: str) -> str:
-    try:
-        if not SECRET_KEY or not INIT_VECTOR:
-            raise ValueError("Secret key or init vector not initialized")
+        value_bytes = value.encode('utf-8')
+        padding_length = 16 - (len(value_bytes) % 16)
+        padded_value = value_bytes + bytes([padding_length]) * padding_length
 
-        iv = INIT_VECTOR.encode('utf-8')
-        key = SECRET_KEY.encode('utf-8')
+        encrypted = encryptor.update(padded_value) + encryptor.finalize()
+        return base64.b64encode(encrypted).decode('utf-8')
 
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
+    def decrypt(self, encrypted: str) -> str:
+        decryptor = self.cipher.decryptor()
 
         encrypted_bytes = base64.b64decode(encrypted)
         decrypted_padded = decryptor.update(
@@ -55,6 +47,52 @@ def decrypt(encrypted: str) -> str:
 
         return decrypted.decode('utf-8')
 
+    def decrypt_many(self, encrypted_values):
+        """Decrypt a list of values in one tight loop"""
+        cipher = self.cipher
+        b64decode = base64.b64decode
+        results = []
+        append = results.append
+        for encrypted in encrypted_values:
+            decryptor = cipher.decryptor()
+            decrypted_padded = decryptor.update(
+                b64decode(encrypted)) + decryptor.finalize()
+            append(decrypted_padded[:-decrypted_padded[-1]].decode('utf-8'))
+        return results
+
+
+_codec = None
+
+
+def get_codec() -> AESCodec:
+    """Return the process-wide codec built from the configured key and IV"""
+    global _codec
+    if _codec is None:
+        _codec = AESCodec(SECRET_KEY, INIT_VECTOR)
+    return _codec
+
+
+def encrypt(value: str) -> str:
+    try:
+        return get_codec().encrypt(value)
+
+    except Exception as ex:
+        raise RuntimeError(f"Encryption error: {str(ex)}") from ex
+
+
+def decrypt(encrypted: str) -> str:
+    try:
+        return get_codec().decrypt(encrypted)
+
+    except Exception as ex:
+        raise RuntimeError(f"Decryption error: {str(ex)}") from ex
+
+
+def decrypt_many(encrypted_values) -> list:
+    """Decrypt a batch of values, e.g. a whole chat history"""
+    try:
+        return get_codec().decrypt_many(encrypted_values)
+
     except Exception as ex:
         raise RuntimeError(f"Decryption error: {str(ex)}") from ex
 
@@ -82,3 +120,100 @@ def decompress(compressed: str) -> str:
 
     except Exception as ex:
         raise RuntimeError(f"Decompression error: {str(ex)}") from ex
+
+
+def decompress_many(compressed_values) -> list:
+    """Decompress a batch of wire strings in one tight loop"""
+    try:
+        b64decode = base64.b64decode
+        zlib_decompress = zlib.decompress
+        return [zlib_decompress(b64decode(compressed)).decode('utf-8')
+                for compressed in compressed_values]
+
+    except Exception as ex:
+        raise RuntimeError(f"Decompression error: {str(ex)}") from ex
+
+
+class CodecCache:
+    """Thread-safe bounded LRU cache for deterministic codec round trips"""
+
+    def __init__(self, maxsize=1024):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry if full"""
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the statistics"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Hit/miss statistics of the cache"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self.entries), "maxsize": self.maxsize}
+
+
+_encode_cache = CodecCache()
+_decode_cache = CodecCache()
+
+
+def encode_identifier(value: str) -> str:
+    """compress(encrypt(value)) memoized for usernames and other identifiers.
+
+    The encryption key and IV are fixed, so the wire form of an identifier
+    never changes. Do not pass passwords or message bodies: they would be
+    kept in memory for the life of the process.
+    """
+    wire = _encode_cache.get(value)
+    if wire is None:
+        wire = compress(encrypt(value))
+        _encode_cache.put(value, wire)
+        _decode_cache.put(wire, value)
+    return wire
+
+
+def decode_identifier(wire: str) -> str:
+    """decrypt(decompress(wire)) memoized for usernames and other identifiers"""
+    value = _decode_cache.get(wire)
+    if value is None:
+        value = decrypt(decompress(wire))
+        _decode_cache.put(wire, value)
+        _encode_cache.put(value, wire)
+    return value
+
+
+def codec_cache_info():
+    """Hit/miss statistics of the identifier codec caches"""
+    return {"encode": _encode_cache.info(), "decode": _decode_cache.info()}
+
+
+def clear_codec_cache():
+    """Empty the identifier codec caches"""
+    _encode_cache.clear()
+    _decode_cache.clear()
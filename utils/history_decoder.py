@@ -0,0 +1,19 @@
+from utils.crypt import decrypt_many, decompress_many, decode_identifier
+
+
+class HistoryDecoder:
+    """Decodes wire-format chat history into (sender, text) pairs.
+
+    History is shown a page at a time, so each page is decoded inline on
+    the REST worker that fetched it; a page is far too small to pay for
+    starting and feeding a worker pool.
+    """
+
+    def decode(self, messages):
+        """Return (sender, text) pairs for the wire-format messages"""
+        senders = [decode_identifier(
+            message.get("sender", {}).get("username", "Unknown"))
+            for message in messages]
+        texts = decrypt_many(decompress_many(
+            [message.get("text", "") for message in messages]))
+        return list(zip(senders, texts))
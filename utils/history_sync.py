@@ -0,0 +1,135 @@
+import threading
+from utils.message_store import MessageStore
+
+
+class HistorySync:
+    """Conversation histories synced page by page into the message store.
+
+    Conversations are keyed by (local, peer) wire-format usernames. The
+    store keeps the messages fetched so far, the plaintext of those
+    already shown, and whether the oldest message of the conversation has
+    been reached. Reopening a chat only asks the server for messages
+    newer than the cursor, and scrolling up asks for the page before the
+    oldest known message.
+
+    Servers that ignore the paging parameters are handled too: an answer
+    that does not match the request is taken as the full history and
+    replaces the stored one. Messages are only decoded when shown.
+    """
+    _instance = None
+
+    def __init__(self, store=None):
+        self.store = store or MessageStore.instance()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide history sync"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def cursor(self, key):
+        """Time of the newest known message, or None if nothing is stored"""
+        return self.store.newest_time(*key)
+
+    def oldest(self, key):
+        """Time of the oldest known message, or None if nothing is stored"""
+        return self.store.oldest_time(*key)
+
+    def is_complete(self, key):
+        """Whether the store reaches back to the start of the conversation"""
+        return self.store.is_complete(*key)
+
+    def request_params(self, key, limit):
+        """Query parameters for the newest page or messages after the cursor"""
+        cursor = self.cursor(key)
+        params = {"limit": limit}
+        if cursor:
+            params["since"] = cursor
+        return params
+
+    def older_than(self, key, anchor, count):
+        """Up to `count` stored messages before the one identified by anchor"""
+        return self.store.messages_before(*key, anchor, count)
+
+    def is_stored(self, key, anchor):
+        """Whether the message identified by anchor is in the store"""
+        return self.store.message_id(*key, anchor) is not None
+
+    def merge_newer(self, key, since, messages, limit):
+        """Merge a reply to a since/limit request.
+
+        Returns (reset, messages to show). The history is replaced when
+        there was no cursor, when the server ignored it, or when a full
+        page came back and older unseen messages may lie behind it.
+        """
+        messages = sorted(messages, key=lambda message: message.get("time", ""))
+        ignored = since is not None and any(
+            message.get("time", "") < since for message in messages)
+        if ignored:
+            print("Server ignored the history cursor, doing a full sync")
+
+        with self.lock:
+            if since is not None and not ignored and len(messages) != limit:
+                new_messages = self.store.add_messages(*key, messages)
+                return len(new_messages) > limit, new_messages[-limit:]
+
+            self.store.replace_messages(*key, messages, len(messages) != limit)
+            return True, messages[-limit:]
+
+    def merge_older(self, key, before, messages, limit, anchor):
+        """Merge a reply to a before/limit request.
+
+        Returns the messages to show above the one identified by anchor.
+        """
+        messages = sorted(messages, key=lambda message: message.get("time", ""))
+        with self.lock:
+            if any(message.get("time", "") >= before for message in messages):
+                print("Server ignored the history page, doing a full sync")
+                self.store.replace_messages(*key, messages, True)
+            else:
+                self.store.add_messages(*key, messages)
+                self.store.set_complete(*key, len(messages) < limit)
+        return self.older_than(key, anchor, limit)
+
+    def page_before(self, messages, anchor, limit):
+        """Pick the page before anchor from a before/limit reply.
+
+        Used for messages that arrived live and were evicted from a chat
+        window. They are not merged into the store, which only holds a
+        contiguous run of history up to its cursor.
+        """
+        messages = sorted(messages, key=lambda message: message.get("time", ""))
+        older = [message for message in messages
+                 if message.get("time", "") < anchor[0]]
+        return older[-limit:]
+
+    def decode(self, key, messages, decoder):
+        """Return (message, sender, text) entries, decoding unseen messages"""
+        plaintexts = self.store.plaintexts(*key, messages)
+        missing = [message for message in messages
+                   if MessageStore.message_row(message) not in plaintexts]
+
+        results = decoder.decode(missing)
+        entries = [(message, *pair) for message, pair in zip(missing, results)]
+        self.store.save_plaintexts(*key, entries)
+
+        decoded = dict(plaintexts)
+        for message, sender, text in entries:
+            decoded[MessageStore.message_row(message)] = (sender, text)
+        return [(message, *decoded[MessageStore.message_row(message)])
+                for message in messages]
+
+    @staticmethod
+    def identity(message):
+        """Fields that identify a message across syncs"""
+        return (message.get("time"),
+                message.get("sender", {}).get("username"),
+                message.get("text"))
+
+    @staticmethod
+    def frame_identity(data, sender=None, text=None):
+        """identity() of a message received or confirmed over the WebSocket"""
+        return (data.get("time"), sender or data.get("sender"),
+                text or data.get("message"))
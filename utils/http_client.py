@@ -0,0 +1,65 @@
+import threading
+from utils.startup_profile import StartupProfile
+from config.config import (SERVER, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+                           HTTP_POOL_SIZE, HTTP_MAX_RETRIES)
+
+
+class HttpClient:
+    """Shared keep-alive HTTP session for all REST calls to SERVER.
+
+    One requests.Session with a pooled adapter is reused for every call so
+    repeated requests ride warm TCP/TLS connections. Every request is
+    retried with backoff if the connection could not be made. Once a
+    request may have reached the server, only GET, HEAD and OPTIONS are
+    retried, on read errors and 502/503/504. PUTs such as a password
+    change carry the old value, so replaying one that was applied would
+    fail. requests is imported here rather than at module level, so it is
+    only loaded once the first call is made.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, base_url=SERVER, pool_size=HTTP_POOL_SIZE,
+                 max_retries=HTTP_MAX_RETRIES,
+                 timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)):
+        with StartupProfile.instance().measure("import requests"):
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide HTTP client"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def request(self, method, path, **kwargs):
+        """Send a request to SERVER + path over the pooled session"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
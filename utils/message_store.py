@@ -0,0 +1,271 @@
+import os
+import sqlite3
+import threading
+from config.config import MESSAGE_STORE_PATH
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    owner TEXT NOT NULL,
+    peer TEXT NOT NULL,
+    sender TEXT,
+    text TEXT,
+    plaintext TEXT,
+    time TEXT,
+    position INTEGER,
+    complete INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (owner, peer)
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    peer TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    text TEXT NOT NULL,
+    time TEXT NOT NULL,
+    plain_sender TEXT,
+    plaintext TEXT,
+    UNIQUE (owner, peer, time, sender, text)
+);
+CREATE INDEX IF NOT EXISTS messages_peer_time
+    ON messages (owner, peer, time);
+CREATE INDEX IF NOT EXISTS conversations_owner_position
+    ON conversations (owner, position);
+"""
+
+
+class MessageStore:
+    """Local SQLite cache of conversations and their messages.
+
+    Rows keep the server's wire-format usernames and ciphertext next to
+    the decrypted plaintext, so views can render straight from disk and
+    only decode what they have never shown before. Conversations are
+    keyed by (owner, peer), the wire-format usernames of the local user
+    and the other participant.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    the GUI thread can read while REST workers write.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, path=MESSAGE_STORE_PATH):
+        if path == ":memory:":
+            self.path = "file:message-store?mode=memory&cache=shared"
+            self.uri = True
+        else:
+            self.create_private(path)
+            self.path = path
+            self.uri = False
+        self.local = threading.local()
+        # Keeps a shared in-memory database alive between connections.
+        self.keeper = self.connection()
+        with self.keeper:
+            self.keeper.executescript(SCHEMA)
+
+    @staticmethod
+    def create_private(path):
+        """Create the database file readable by its owner only.
+
+        It holds decrypted messages. A directory is only given mode 0o700
+        when it is created here; SQLite gives its WAL and shared-memory
+        files the database file's mode.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        for name in (path, f"{path}-wal", f"{path}-shm"):
+            if os.path.exists(name):
+                os.chmod(name, 0o600)
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide store, opening it on first use"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def connection(self):
+        """Return the calling thread's connection"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, uri=self.uri, timeout=10, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+        return connection
+
+    @staticmethod
+    def message_dict(row):
+        """Turn a (sender, text, time) row into the server's message shape"""
+        sender, text, time_str = row
+        return {"sender": {"username": sender}, "text": text, "time": time_str}
+
+    @staticmethod
+    def message_row(message):
+        """Return the (sender, text, time) columns of a server message"""
+        return (message.get("sender", {}).get("username", "Unknown"),
+                message.get("text", ""), message.get("time", ""))
+
+    def newest_time(self, owner, peer):
+        """Time of the newest stored message, or None"""
+        row = self.connection().execute(
+            "SELECT MAX(time) FROM messages WHERE owner = ? AND peer = ?",
+            (owner, peer)).fetchone()
+        return row[0]
+
+    def oldest_time(self, owner, peer):
+        """Time of the oldest stored message, or None"""
+        row = self.connection().execute(
+            "SELECT MIN(time) FROM messages WHERE owner = ? AND peer = ?",
+            (owner, peer)).fetchone()
+        return row[0]
+
+    def is_complete(self, owner, peer):
+        """Whether the stored history reaches back to the first message"""
+        row = self.connection().execute(
+            "SELECT complete FROM conversations WHERE owner = ? AND peer = ?",
+            (owner, peer)).fetchone()
+        return bool(row and row[0])
+
+    def set_complete(self, owner, peer, complete):
+        """Record whether the stored history is complete"""
+        connection = self.connection()
+        with connection:
+            connection.execute(
+                "INSERT INTO conversations (owner, peer, complete) "
+                "VALUES (?, ?, ?) ON CONFLICT (owner, peer) "
+                "DO UPDATE SET complete = excluded.complete",
+                (owner, peer, int(complete)))
+
+    def messages_before(self, owner, peer, anchor, count):
+        """Up to `count` messages, oldest first, before the anchor message.
+
+        anchor is a (time, sender, text) tuple; None means the newest end.
+        """
+        connection = self.connection()
+        if anchor is None:
+            rows = connection.execute(
+                "SELECT sender, text, time FROM messages "
+                "WHERE owner = ? AND peer = ? "
+                "ORDER BY time DESC, id DESC LIMIT ?",
+                (owner, peer, count)).fetchall()
+        else:
+            found = self.message_id(owner, peer, anchor)
+            if found is None:
+                return []
+            rows = connection.execute(
+                "SELECT sender, text, time FROM messages "
+                "WHERE owner = ? AND peer = ? AND (time, id) < (?, ?) "
+                "ORDER BY time DESC, id DESC LIMIT ?",
+                (owner, peer, anchor[0], found, count)).fetchall()
+        return [self.message_dict(row) for row in reversed(rows)]
+
+    def message_id(self, owner, peer, anchor):
+        """Row id of the (time, sender, text) anchor message, or None"""
+        time_str, sender, text = anchor
+        row = self.connection().execute(
+            "SELECT id FROM messages WHERE owner = ? AND peer = ? "
+            "AND time = ? AND sender = ? AND text = ?",
+            (owner, peer, time_str, sender, text)).fetchone()
+        return row[0] if row else None
+
+    def add_messages(self, owner, peer, messages):
+        """Store messages, returning those that were not stored yet"""
+        added = []
+        connection = self.connection()
+        with connection:
+            for message in messages:
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO messages "
+                    "(owner, peer, sender, text, time) VALUES (?, ?, ?, ?, ?)",
+                    (owner, peer, *self.message_row(message)))
+                if cursor.rowcount:
+                    added.append(message)
+        return added
+
+    def replace_messages(self, owner, peer, messages, complete):
+        """Swap in a new history, keeping plaintext already decrypted"""
+        connection = self.connection()
+        with connection:
+            plaintexts = {
+                (sender, text, time_str): (plain_sender, plaintext)
+                for sender, text, time_str, plain_sender, plaintext
+                in connection.execute(
+                    "SELECT sender, text, time, plain_sender, plaintext "
+                    "FROM messages WHERE owner = ? AND peer = ? "
+                    "AND plaintext IS NOT NULL", (owner, peer))}
+            connection.execute(
+                "DELETE FROM messages WHERE owner = ? AND peer = ?",
+                (owner, peer))
+            connection.executemany(
+                "INSERT OR IGNORE INTO messages (owner, peer, sender, text, "
+                "time, plain_sender, plaintext) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(owner, peer, *row, *plaintexts.get(row, (None, None)))
+                 for row in map(self.message_row, messages)])
+        self.set_complete(owner, peer, complete)
+
+    def plaintexts(self, owner, peer, messages):
+        """Map (sender, text, time) to cached (sender, text) plaintext"""
+        connection = self.connection()
+        found = {}
+        for message in messages:
+            row = self.message_row(message)
+            cached = connection.execute(
+                "SELECT plain_sender, plaintext FROM messages "
+                "WHERE owner = ? AND peer = ? AND sender = ? AND text = ? "
+                "AND time = ? AND plaintext IS NOT NULL",
+                (owner, peer, *row)).fetchone()
+            if cached:
+                found[row] = cached
+        return found
+
+    def save_plaintexts(self, owner, peer, entries):
+        """Cache the plaintext of decoded (message, sender, text) entries"""
+        connection = self.connection()
+        with connection:
+            connection.executemany(
+                "UPDATE messages SET plain_sender = ?, plaintext = ? "
+                "WHERE owner = ? AND peer = ? AND sender = ? AND text = ? "
+                "AND time = ?",
+                [(sender, text, owner, peer, *self.message_row(message))
+                 for message, sender, text in entries])
+
+    def chats(self, owner):
+        """Stored chat list of a user as (chat, plaintext) in server order"""
+        rows = self.connection().execute(
+            "SELECT peer, sender, text, plaintext, time FROM conversations "
+            "WHERE owner = ? AND position IS NOT NULL ORDER BY position",
+            (owner,)).fetchall()
+        chats = []
+        for peer, sender, text, plaintext, time_str in rows:
+            receiver = peer if sender == owner else owner
+            chats.append(({"sender": {"username": sender},
+                           "receiver": {"username": receiver},
+                           "text": text, "time": time_str}, plaintext))
+        return chats
+
+    def replace_chats(self, owner, chats, plaintexts):
+        """Store the chat list the server returned for a user"""
+        connection = self.connection()
+        with connection:
+            connection.execute(
+                "UPDATE conversations SET position = NULL WHERE owner = ?",
+                (owner,))
+            for position, (chat, plaintext) in enumerate(
+                    zip(chats, plaintexts)):
+                sender = chat.get("sender", {}).get("username", "Unknown")
+                receiver = chat.get("receiver", {}).get("username", "Unknown")
+                peer = receiver if sender == owner else sender
+                connection.execute(
+                    "INSERT INTO conversations "
+                    "(owner, peer, sender, text, plaintext, time, position) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (owner, peer) "
+                    "DO UPDATE SET sender = excluded.sender, "
+                    "text = excluded.text, plaintext = excluded.plaintext, "
+                    "time = excluded.time, position = excluded.position",
+                    (owner, peer, sender, chat.get("text", ""), plaintext,
+                     chat.get("time", ""), position))
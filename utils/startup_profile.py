@@ -0,0 +1,75 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Imported first by main.py, so this is as close to launch as we can get.
+IMPORT_TIME = time.perf_counter()
+
+
+class StartupProfile:
+    """Timings of the startup phases, collected for --profile-startup.
+
+    mark() closes a sequential phase that started at the previous mark;
+    measure() times a block that may run later or on another thread, such
+    as building a screen or a deferred import. Nothing is recorded unless
+    the profile has been enabled.
+    """
+    _instance = None
+
+    def __init__(self):
+        self.enabled = False
+        self.start = IMPORT_TIME
+        self.last_mark = self.start
+        self.phases = []
+        self.lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide startup profile"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def enable(self):
+        """Start recording"""
+        self.enabled = True
+
+    def record(self, name, begin, end):
+        """Store one phase, given perf_counter() start and end times"""
+        with self.lock:
+            self.phases.append((name, begin - self.start, end - begin,
+                                threading.current_thread().name))
+
+    def mark(self, name):
+        """Record the phase that ran since the previous mark"""
+        now = time.perf_counter()
+        if self.enabled:
+            self.record(name, self.last_mark, now)
+        self.last_mark = now
+
+    @contextmanager
+    def measure(self, name):
+        """Record how long the with-block takes"""
+        if not self.enabled:
+            yield
+            return
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, begin, time.perf_counter())
+
+    def report(self):
+        """Return the recorded phases as a text table"""
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        lines = [f"{'start ms':>9}  {'took ms':>8}  {'thread':<12}  phase"]
+        for name, offset, duration, thread in phases:
+            lines.append(f"{offset * 1000:9.1f}  {duration * 1000:8.1f}  "
+                         f"{thread[:12]:<12}  {name}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the report to a file"""
+        with open(path, "w") as report_file:
+            report_file.write(self.report())
@@ -1,34 +1,287 @@
-import websocket
 import json
+import random
 import threading
 import time
+import uuid
+from collections import deque
 from PyQt5.QtCore import QObject, pyqtSignal
 from config.config import WEBSOCKET_SERVER
+from utils.startup_profile import StartupProfile
+
+
+class ReconnectBackoff:
+    """Capped exponential backoff with jitter for reconnect delays.
+
+    Delays grow as base_delay * factor ** attempt up to max_delay, and each
+    one is shortened by a random fraction of up to `jitter` so that a fleet
+    of clients dropped by the same server restart does not reconnect in
+    lockstep. max_attempts=None retries forever.
+    """
+
+    def __init__(self, base_delay=1.0, max_delay=60.0, factor=2.0,
+                 jitter=0.5, max_attempts=None):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.attempts = 0
+
+    def next_delay(self):
+        """Return the delay before the next attempt, or None to give up"""
+        if self.max_attempts is not None and self.attempts >= self.max_attempts:
+            return None
+        delay = min(self.max_delay, self.base_delay *
+                    self.factor ** self.attempts)
+        self.attempts += 1
+        return delay * (1 - self.jitter * random.random())
+
+    def reset(self):
+        """Start over from the base delay after a successful connection"""
+        self.attempts = 0
+
+
+class OutboundQueue:
+    """Bounded FIFO of outbound frames shared by callers and the writer thread.
+
+    When the queue is full, `policy` decides what put() does: "block" waits
+    up to block_timeout seconds for room, "drop_oldest" discards the oldest
+    queued frame and "fail" rejects the new one.
+    """
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    FAIL = "fail"
+
+    def __init__(self, maxsize=500, policy=FAIL, block_timeout=5.0):
+        if policy not in (self.BLOCK, self.DROP_OLDEST, self.FAIL):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.items = deque()
+        self.dropped = 0
+        self.condition = threading.Condition()
+
+    def __len__(self):
+        with self.condition:
+            return len(self.items)
+
+    def put(self, item):
+        """Queue a frame, applying the overflow policy; False if rejected"""
+        with self.condition:
+            if len(self.items) >= self.maxsize:
+                if self.policy == self.FAIL:
+                    return False
+                if self.policy == self.DROP_OLDEST:
+                    self.items.popleft()
+                    self.dropped += 1
+                elif not self.condition.wait_for(
+                        lambda: len(self.items) < self.maxsize,
+                        self.block_timeout):
+                    return False
+            self.items.append(item)
+            self.condition.notify_all()
+            return True
+
+    def get_batch(self, max_items, timeout):
+        """Wait up to timeout for frames and take up to max_items of them"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items, timeout):
+                return []
+            count = min(max_items, len(self.items))
+            batch = [self.items.popleft() for _ in range(count)]
+            self.condition.notify_all()
+            return batch
+
+    def requeue(self, items):
+        """Put unsent frames back at the front, keeping their order"""
+        with self.condition:
+            self.items.extendleft(reversed(items))
+            self.condition.notify_all()
+
+    def wake(self):
+        """Wake up threads waiting on the queue"""
+        with self.condition:
+            self.condition.notify_all()
+
+
+class PendingAcks:
+    """Sent messages awaiting a delivery receipt, keyed by client message ID.
+
+    A message whose receipt does not arrive within `timeout` seconds is
+    handed back for resending up to `max_retries` times and then reported
+    as failed. The server is expected to de-duplicate resends by ID.
+
+    Messages are tracked right before they are written, so a receipt can
+    never arrive for a message that is not tracked yet. A receipt that
+    arrives while a resend is still queued cancels the resend.
+    """
+
+    def __init__(self, timeout=10.0, max_retries=2):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.entries = {}
+        self.cancelled = set()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def track(self, message_data):
+        """Start the receipt timer for a message about to be sent.
+
+        Returns False for a resend whose receipt has arrived meanwhile;
+        such a frame should not be sent again.
+        """
+        message_id = message_data["id"]
+        with self.lock:
+            if message_id in self.cancelled:
+                self.cancelled.discard(message_id)
+                return False
+            entry = self.entries.get(message_id)
+            retries = entry[1] + 1 if entry else 0
+            self.entries[message_id] = (
+                time.monotonic() + self.timeout, retries, message_data)
+            return True
+
+    def untrack(self, message_data):
+        """Undo track() for a message that could not be written"""
+        message_id = message_data["id"]
+        with self.lock:
+            entry = self.entries.get(message_id)
+            if entry is None:
+                return
+            if entry[1] == 0:
+                del self.entries[message_id]
+            else:
+                self.entries[message_id] = (
+                    float("inf"), entry[1] - 1, message_data)
+
+    def acknowledge(self, message_id):
+        """Forget a delivered message; False if it was not pending"""
+        with self.lock:
+            entry = self.entries.pop(message_id, None)
+            if entry is not None and entry[0] == float("inf"):
+                # Its resend is queued; track() will drop it.
+                self.cancelled.add(message_id)
+            return entry is not None
+
+    def discard(self, message_id):
+        """Stop tracking a message that is sent without awaiting a receipt"""
+        with self.lock:
+            self.entries.pop(message_id, None)
+            self.cancelled.discard(message_id)
+
+    def expired(self):
+        """Split timed-out messages into (frames to resend, failed IDs)"""
+        now = time.monotonic()
+        retry, failed = [], []
+        with self.lock:
+            for message_id, entry in list(self.entries.items()):
+                deadline, retries, message_data = entry
+                if deadline > now:
+                    continue
+                if retries < self.max_retries:
+                    retry.append(message_data)
+                    self.entries[message_id] = (
+                        float("inf"), retries, message_data)
+                else:
+                    failed.append(message_id)
+                    del self.entries[message_id]
+        return retry, failed
 
 
 class PersistentWebSocketClient(QObject):
     """Persistent WebSocket client that maintains connection for chat session"""
     message_received = pyqtSignal(dict)
     connection_status_changed = pyqtSignal(str, str)
+    connection_ready = pyqtSignal()
+    delivery_failed = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, sender_username):
+    def __init__(self, sender_username, max_reconnect_attempts=None,
+                 queue_size=500, overflow_policy=OutboundQueue.FAIL,
+                 max_batch_size=50, ack_timeout=10.0, max_send_retries=2,
+                 welcome_timeout=2.0):
         super().__init__()
         self.sender_username = sender_username
         self.ws = None
+        self.ws_thread = None
+        self.writer_thread = None
+        self.outbound = OutboundQueue(queue_size, overflow_policy)
+        self.pending_acks = PendingAcks(ack_timeout, max_send_retries)
+        self.max_batch_size = max_batch_size
+        self.server_batching = False
+        self.server_receipt_ids = False
+        self.welcome_timeout = welcome_timeout
+        self.error_reported = False
+        self.opened_at = None
         self.connected = False
+        self.connected_event = threading.Event()
+        self.ready_event = threading.Event()
+        self.stop_event = threading.Event()
         self.keep_running = True
-        self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 5
+        self.backoff = ReconnectBackoff(max_attempts=max_reconnect_attempts)
+        self.total_reconnect_attempts = 0
+        self.disconnected_since = None
+        self.total_disconnected_time = 0.0
+
+    @property
+    def reconnect_attempts(self):
+        """Reconnect attempts made since the connection was last open"""
+        return self.backoff.attempts
 
-    def connect(self, receiver_username=None):
-        """Connect to WebSocket server"""
+    @property
+    def max_reconnect_attempts(self):
+        """Reconnect attempts allowed per outage, None for unlimited"""
+        return self.backoff.max_attempts
+
+    def connect(self):
+        """Start connecting to the WebSocket server without blocking.
+
+        Returns True once the connection thread is running (or the client is
+        already connected). Readiness is reported through connection_ready;
+        use wait_until_connected() where a synchronous wait is needed.
+        """
         if self.connected:
             return True
 
+        if self.ws_thread is not None and self.ws_thread.is_alive():
+            return True
+
         try:
-            websocket_server_uri = f"{WEBSOCKET_SERVER}"
+            self.keep_running = True
+            self.stop_event.clear()
+            self.connected_event.clear()
+            self.ready_event.clear()
+            self.backoff.reset()
+            self.mark_disconnected()
 
+            self.ws_thread = threading.Thread(target=self.run)
+            self.ws_thread.daemon = True
+            self.ws_thread.start()
+
+            if self.writer_thread is None or not self.writer_thread.is_alive():
+                self.writer_thread = threading.Thread(target=self.write_loop)
+                self.writer_thread.daemon = True
+                self.writer_thread.start()
+            return True
+
+        except Exception as e:
+            print(f"WebSocket connection error: {e}")
+            self.error_occurred.emit(f"Connection error: {str(e)}")
+            return False
+
+    def run(self):
+        """Connection thread: run the socket and reconnect with backoff"""
+        with StartupProfile.instance().measure("import websocket"):
+            import websocket
+        websocket_server_uri = f"{WEBSOCKET_SERVER}"
+
+        while self.keep_running:
+            self.connection_status_changed.emit(
+                "connecting", "Connecting to server...")
             self.ws = websocket.WebSocketApp(
                 websocket_server_uri,
                 on_open=self.on_open,
@@ -36,40 +289,105 @@ class PersistentWebSocketClient(QObject):
                 on_error=self.on_error,
                 on_close=self.on_close
             )
+            if not self.keep_running:
+                break
+            self.ws.run_forever()
 
-            self.receiver_username = receiver_username
-            self.connection_status_changed.emit(
-                "connecting", "Connecting to server...")
+            self.connected = False
+            self.connected_event.clear()
+            self.ready_event.clear()
+            self.mark_disconnected()
+            if not self.keep_running:
+                break
 
-            self.ws_thread = threading.Thread(target=self.ws.run_forever)
-            self.ws_thread.daemon = True
-            self.ws_thread.start()
+            delay = self.backoff.next_delay()
+            if delay is None:
+                print("Giving up reconnecting to server")
+                self.error_occurred.emit(
+                    f"Could not reconnect after {self.backoff.attempts} attempts")
+                break
+
+            self.total_reconnect_attempts += 1
+            print(f"Reconnecting in {delay:.1f}s (attempt "
+                  f"{self.backoff.attempts})")
+            self.connection_status_changed.emit(
+                "connecting", f"Reconnecting in {delay:.0f}s...")
+            if self.stop_event.wait(delay):
+                break
 
-            timeout = 5
-            start_time = time.time()
+        self.connection_status_changed.emit(
+            "disconnected", "Disconnected from server")
 
-            while (time.time() - start_time) < timeout and not self.connected:
-                time.sleep(0.1)
+    def wait_until_connected(self, timeout=5.0):
+        """Block for at most timeout seconds until the connection is open"""
+        return self.connected_event.wait(timeout)
 
-            return self.connected
+    def wait_until_ready(self, timeout):
+        """Wait until the connection is open and its capabilities known.
 
-        except Exception as e:
-            print(f"WebSocket connection error: {e}")
-            self.error_occurred.emit(f"Connection error: {str(e)}")
+        The writer holds back until the welcome frame arrives, so frames
+        queued while offline are batched and tracked as the server allows.
+        Servers that send no welcome are written to after welcome_timeout
+        with the capabilities last announced.
+        """
+        if not self.connected_event.wait(timeout):
+            return False
+        if self.ready_event.is_set():
+            return True
+        opened_at = self.opened_at
+        if opened_at is None:
             return False
+        remaining = opened_at + self.welcome_timeout - time.monotonic()
+        return remaining <= 0 or self.ready_event.wait(min(remaining, timeout))
+
+    def mark_disconnected(self):
+        """Start the outage clock if it is not already running"""
+        if self.disconnected_since is None:
+            self.disconnected_since = time.monotonic()
+
+    def disconnected_time(self):
+        """Total seconds spent without an open connection"""
+        total = self.total_disconnected_time
+        if self.disconnected_since is not None:
+            total += time.monotonic() - self.disconnected_since
+        return total
+
+    def connection_stats(self):
+        """Counters describing reconnect behaviour of this client"""
+        return {
+            "connected": self.connected,
+            "reconnect_attempts": self.reconnect_attempts,
+            "total_reconnect_attempts": self.total_reconnect_attempts,
+            "disconnected_seconds": self.disconnected_time(),
+        }
 
     def on_open(self, ws):
         """Handle connection opening"""
         print("WebSocket connection opened successfully")
         self.connected = True
-        self.reconnect_attempts = 0
+        self.error_reported = False
+        self.opened_at = time.monotonic()
+        self.connected_event.set()
+        self.backoff.reset()
+        if self.disconnected_since is not None:
+            self.total_disconnected_time += (
+                time.monotonic() - self.disconnected_since)
+            self.disconnected_since = None
         self.connection_status_changed.emit("connected", "Connected to server")
+        self.connection_ready.emit()
 
     def on_message(self, ws, message):
         """Handle incoming messages"""
         try:
             data = json.loads(message)
             print(f"Received WebSocket message: {data}")
+            if data.get("status") == "welcome":
+                capabilities = data.get("capabilities", [])
+                self.server_batching = "batch" in capabilities
+                self.server_receipt_ids = "ids" in capabilities
+                self.ready_event.set()
+            elif data.get("status") == "delivered" and "id" in data:
+                self.pending_acks.acknowledge(data["id"])
             self.message_received.emit(data)
 
         except json.JSONDecodeError:
@@ -78,49 +396,201 @@ class PersistentWebSocketClient(QObject):
             self.error_occurred.emit(error_msg)
 
     def on_error(self, ws, error):
-        """Handle WebSocket errors"""
+        """Handle WebSocket errors.
+
+        Every failed attempt updates the connection status, but only the
+        first error since the connection was last open is reported through
+        error_occurred; run() reports it again if reconnecting gives up.
+        """
         print(f"WebSocket error: {error}")
         self.connected = False
-        self.error_occurred.emit(str(error))
+        self.connected_event.clear()
+        self.ready_event.clear()
+        self.connection_status_changed.emit(
+            "disconnected", f"Connection error: {error}")
+        if not self.error_reported:
+            self.error_reported = True
+            self.error_occurred.emit(str(error))
 
     def on_close(self, ws, close_status_code, close_msg):
-        """Handle connection closure"""
+        """Handle connection closure; run() schedules any reconnect"""
         print(f"WebSocket connection closed: {
               close_status_code} - {close_msg}")
         self.connected = False
+        self.connected_event.clear()
+        self.ready_event.clear()
+        self.mark_disconnected()
         self.connection_status_changed.emit(
             "disconnected", "Disconnected from server")
 
-        if self.keep_running and self.reconnect_attempts < self.max_reconnect_attempts:
-            self.reconnect_attempts += 1
-            print(f"Attempting to reconnect ({
-                  self.reconnect_attempts}/{self.max_reconnect_attempts})")
-            time.sleep(2)
-            self.connect(self.receiver_username)
-
     def send_message(self, receiver_username, message):
-        """Send a message through the WebSocket connection"""
-        if not self.connected or not self.ws:
-            print("Cannot send message - not connected to server")
-            self.error_occurred.emit("Not connected to server")
-            return False
+        """Queue a message for the writer thread.
 
-        try:
-            message_data = {
-                "sender": self.sender_username,
-                "receiver": receiver_username,
-                "message": message
-            }
-            self.ws.send(json.dumps(message_data))
-            return True
-        except Exception as e:
-            print(f"Error sending message: {e}")
-            self.error_occurred.emit(f"Error sending message: {str(e)}")
-            return False
+        Messages queued while disconnected are sent once the connection is
+        (re)established. Returns the client-generated message ID, which the
+        server echoes in the delivery receipt, or None if the outbound queue
+        rejected the message.
+        """
+        message_data = {
+            "id": uuid.uuid4().hex,
+            "sender": self.sender_username,
+            "receiver": receiver_username,
+            "message": message
+        }
+        if not self.outbound.put(message_data):
+            print("Cannot send message - outbound queue is full")
+            self.error_occurred.emit("Too many unsent messages")
+            return None
+        return message_data["id"]
+
+    def write_loop(self):
+        """Writer thread: drain the outbound queue while connected.
+
+        Receipts are only awaited, and unacknowledged messages resent, when
+        the server announced in its welcome frame that it echoes message
+        IDs in delivery receipts.
+        """
+        while self.keep_running:
+            self.check_pending_acks()
+            if not self.wait_until_ready(0.5):
+                continue
+
+            batch = self.outbound.get_batch(self.max_batch_size, 0.5)
+            tracking = self.server_receipt_ids
+            if tracking:
+                batch = [message_data for message_data in batch
+                         if self.pending_acks.track(message_data)]
+            else:
+                for message_data in batch:
+                    self.pending_acks.discard(message_data["id"])
+            if not batch:
+                continue
+
+            sent = 0
+            try:
+                if self.server_batching and len(batch) > 1:
+                    self.ws.send(json.dumps({"batch": batch}))
+                    sent = len(batch)
+                else:
+                    for message_data in batch:
+                        self.ws.send(json.dumps(message_data))
+                        sent += 1
+            except Exception as e:
+                print(f"Error sending message, will retry: {e}")
+                if tracking:
+                    for message_data in batch[sent:]:
+                        self.pending_acks.untrack(message_data)
+                self.outbound.requeue(batch[sent:])
+                self.stop_event.wait(0.5)
+
+    def check_pending_acks(self):
+        """Resend messages whose receipt timed out, report the hopeless ones"""
+        retry, failed = self.pending_acks.expired()
+        if retry:
+            self.outbound.requeue(retry)
+        for message_id in failed:
+            print(f"Message {message_id} was not acknowledged")
+            self.delivery_failed.emit(message_id)
 
     def close(self):
         """Close the WebSocket connection"""
         self.keep_running = False
+        self.stop_event.set()
+        self.outbound.wake()
         if self.ws:
             self.ws.close()
         self.connected = False
+        self.connected_event.clear()
+        self.ready_event.clear()
+
+
+class WebSocketConnectionManager(QObject):
+    """Process-wide owner of the single WebSocket connection shared by all chat views.
+
+    Views take a reference with acquire() and give it back with release();
+    the socket is closed once the last reference is released. Inbound frames
+    are routed to the handlers subscribed for the (local user, peer)
+    conversation they belong to, both given as wire-format usernames.
+    """
+    _instance = None
+
+    def __init__(self):
+        super().__init__()
+        self.client = None
+        self.ref_count = 0
+        self.routes = {}
+
+    @classmethod
+    def instance(cls):
+        """Return the process-wide connection manager"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def acquire(self, sender_username):
+        """Take a reference on the shared client, creating it on first use"""
+        if self.client is not None and self.client.sender_username != sender_username:
+            print("Logged in user changed, replacing shared WebSocket connection")
+            self._shutdown()
+
+        if self.client is None:
+            self.client = PersistentWebSocketClient(sender_username)
+            self.client.message_received.connect(self.dispatch)
+
+        self.ref_count += 1
+        return self.client
+
+    def release(self, client):
+        """Drop a reference, closing the connection when nobody uses it"""
+        if client is not self.client or self.ref_count == 0:
+            return
+        self.ref_count -= 1
+        if self.ref_count == 0:
+            self._shutdown()
+
+    def subscribe(self, local_username, peer_username, handler):
+        """Route frames of the (local, peer) wire-format conversation to handler"""
+        handlers = self.routes.setdefault((local_username, peer_username), [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def unsubscribe(self, local_username, peer_username, handler):
+        """Stop routing frames of the (local, peer) conversation to handler"""
+        key = (local_username, peer_username)
+        handlers = self.routes.get(key, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self.routes.pop(key, None)
+
+    def dispatch(self, data):
+        """Route an inbound frame to the handlers of its conversation.
+
+        Usernames are compared in their wire form: encryption uses a fixed
+        key and IV, so a user always maps to the same compressed ciphertext
+        and frames can be routed without any crypto work.
+        """
+        status = data.get("status")
+        if status == "welcome":
+            return
+
+        sender = data.get("sender", "")
+        receiver = data.get("receiver", "")
+
+        # Delivery receipts echo our own message back, so the local user is
+        # the sender; for chat messages the local user is the receiver.
+        if status == "delivered":
+            key = (sender, receiver)
+        else:
+            key = (receiver, sender)
+
+        for handler in list(self.routes.get(key, [])):
+            handler(data)
+
+    def _shutdown(self):
+        """Close the current connection and forget it"""
+        if self.client is not None:
+            self.client.message_received.disconnect(self.dispatch)
+            self.client.close()
+        self.client = None
+        self.ref_count = 0
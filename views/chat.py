@@ -1,80 +1,34 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QScrollArea, QSizePolicy, QApplication)
-from PyQt5.QtGui import QFont, QPainter, QPainterPath, QLinearGradient, QColor, QPalette
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSizePolicy
+from PyQt5.QtGui import QFont, QLinearGradient, QColor, QPalette
 from PyQt5.QtCore import Qt, QMetaObject, Q_ARG, QTimer
 import threading
 import json
-import requests
 import time
-from components.message import MessageWidget
-from utils.websocket_client import PersistentWebSocketClient
+from components.message_list import MessageListView
+from components.theme import set_state
+from components.widgets import GradientButton, RoundedLineEdit, PINK, VIOLET
+from utils.websocket_client import WebSocketConnectionManager
 from utils.format import formatDate
-from config.config import SERVER
-from utils.crypt import encrypt, decrypt, compress, decompress
+from utils.api_client import ApiClient
+from utils.crypt import (encrypt, decrypt, compress, decompress,
+                         encode_identifier)
+from utils.history_decoder import HistoryDecoder
+from utils.history_sync import HistorySync
+from config.config import (HISTORY_PAGE_SIZE, MESSAGE_WINDOW_SIZE,
+                           SHOW_MEMORY_GAUGE)
 
 
-class RoundedLineEdit(QLineEdit):
-    def __init__(self, placeholder="", parent=None):
-        super().__init__(parent)
-        self.setMinimumHeight(44)
-        self.setFont(QFont("Segoe UI", 11))
-        self.setPlaceholderText(placeholder)
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(Qt.NoPen)
-
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, self.width(), self.height(), 12, 12)
-
-        if self.hasFocus():
-            painter.setPen(QColor("#7B68EE"))
-        else:
-            painter.setPen(QColor("#D8BFD8"))
-
-        painter.setBrush(Qt.NoBrush)
-        painter.drawPath(path)
-
-
-class GradientButton(QPushButton):
-    def __init__(self, text, color_scheme, parent=None):
-        super().__init__(text, parent)
-        self.color_scheme = color_scheme
-        self.setCursor(Qt.PointingHandCursor)
-        self.setMinimumSize(100, 44)
-        self.setFont(QFont("Segoe UI", 11, QFont.Bold))
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        path = QPainterPath()
-        path.addRoundedRect(2, 2, self.width()-4, self.height()-4, 10, 10)
-
-        gradient = QLinearGradient(0, 0, 0, self.height())
-
-        if self.isEnabled():
-            if self.underMouse():
-                gradient.setColorAt(0, self.color_scheme["hover_top"])
-                gradient.setColorAt(1, self.color_scheme["hover_bottom"])
-            else:
-                gradient.setColorAt(0, self.color_scheme["normal_top"])
-                gradient.setColorAt(1, self.color_scheme["normal_bottom"])
-        else:
-            gradient.setColorAt(0, QColor("#D3D3D3"))
-            gradient.setColorAt(1, QColor("#C0C0C0"))
-
-        painter.fillPath(path, gradient)
-
-        painter.setPen(QColor(self.color_scheme["text"]))
-        painter.setFont(self.font())
-        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+class ChatWindow(QWidget):
+    """One conversation, keeping at most a window of messages in memory.
 
+    Once more than `window_size` messages are shown, the oldest are evicted
+    down to a page below the cap while the view follows the newest ones.
+    Scrolling back reloads them from the message store, or from the server
+    for messages that arrived live and were never stored.
+    """
+    LIVE_UPDATE_INTERVAL = 16  # ms; live messages are added once per frame
+    MEMORY_GAUGE_INTERVAL = 250  # ms
 
-class ChatWindow(QWidget):
     def __init__(self, parent, chat_username, current_username):
         super().__init__()
         self.parent = parent
@@ -84,17 +38,33 @@ class ChatWindow(QWidget):
         self.is_sending = False
         self.last_message_time = None
         self.pending_messages = {}
-
-        encrypted_current_username = encrypt(current_username)
-        compressed_current_username = compress(encrypted_current_username)
-        self.websocket_client = PersistentWebSocketClient(
-            compressed_current_username)
-        self.websocket_client.message_received.connect(
+        self.pending_by_text = {}
+        self.history_decoder = HistoryDecoder()
+        self.history_sync = HistorySync.instance()
+        self.history_request = None
+        self.oldest_shown = None
+        self.scroll_anchor = None
+        self.live_messages = []
+        self.window_size = max(MESSAGE_WINDOW_SIZE, 2 * HISTORY_PAGE_SIZE)
+        self.evicted = 0
+
+        self.compressed_current_username = encode_identifier(current_username)
+        self.compressed_chat_username = encode_identifier(chat_username)
+        self.history_key = (self.compressed_current_username,
+                            self.compressed_chat_username)
+
+        self.connection_manager = WebSocketConnectionManager.instance()
+        self.websocket_client = self.connection_manager.acquire(
+            self.compressed_current_username)
+        self.connection_manager.subscribe(
+            self.compressed_current_username, self.compressed_chat_username,
             self.handle_websocket_message)
         self.websocket_client.connection_status_changed.connect(
             self.update_connection_status)
         self.websocket_client.error_occurred.connect(
             self.handle_websocket_error)
+        self.websocket_client.delivery_failed.connect(
+            self.handle_delivery_failed)
 
         self.setWindowTitle(f"{chat_username}")
         self.setWindowFlags(Qt.Window)
@@ -115,106 +85,77 @@ class ChatWindow(QWidget):
         main_layout.setSpacing(0)
 
         header = QWidget()
+        header.setObjectName("ChatHeader")
         header.setFixedHeight(60)
-        header.setStyleSheet("""
-            background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                stop: 0 #7B68EE, stop: 1 #6A5ACD);
-            border-bottom: 1px solid #5C4AA8;
-        """)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(20, 0, 20, 0)
 
-        back_button = GradientButton("←", {
-            "normal_top": QColor("#9370DB"),
-            "normal_bottom": QColor("#7B68EE"),
-            "hover_top": QColor("#A891D6"),
-            "hover_bottom": QColor("#9370DB"),
-            "text": "#FFFFFF"
-        })
+        back_button = GradientButton("←", VIOLET, radius=10, font_size=11)
         back_button.setFixedSize(40, 40)
         back_button.clicked.connect(self.close_chat)
         header_layout.addWidget(back_button)
 
         chat_title = QLabel(f"{chat_username}")
         chat_title.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        chat_title.setStyleSheet("color: #FFFFFF; background: transparent;")
+        chat_title.setObjectName("ChatTitle")
         chat_title.setAlignment(Qt.AlignCenter)
         header_layout.addWidget(chat_title, 1)
 
+        self.memory_gauge = QLabel()
+        self.memory_gauge.setFont(QFont("Segoe UI", 9))
+        self.memory_gauge.setObjectName("MemoryGauge")
+        self.memory_gauge.setVisible(SHOW_MEMORY_GAUGE)
+        header_layout.addWidget(self.memory_gauge)
+
         self.connection_status = QLabel("●")
         self.connection_status.setFont(QFont("Segoe UI", 16))
-        self.connection_status.setStyleSheet(
-            "color: #4ECDC4; background: transparent;")
+        self.connection_status.setObjectName("ConnectionStatus")
         self.connection_status.setToolTip("Ready")
         header_layout.addWidget(self.connection_status)
 
         main_layout.addWidget(header)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: rgba(177, 156, 217, 0.3);
-                width: 8px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(107, 91, 149, 0.5);
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(107, 91, 149, 0.7);
-            }
-        """)
-
-        self.messages_container = QWidget()
-        self.messages_layout = QVBoxLayout(self.messages_container)
-        self.messages_layout.setContentsMargins(15, 15, 15, 15)
-        self.messages_layout.setSpacing(10)
-        self.messages_layout.addStretch()
-
-        self.scroll_area.setWidget(self.messages_container)
-        main_layout.addWidget(self.scroll_area)
+        self.message_list = MessageListView()
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(0)
+        self.scroll_timer.timeout.connect(self.message_list.scrollToBottom)
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_UPDATE_INTERVAL)
+        self.live_timer.timeout.connect(self.flush_live_messages)
+        self.message_list.verticalScrollBar().valueChanged.connect(
+            self.handle_scroll)
+        self.message_list.verticalScrollBar().rangeChanged.connect(
+            self.handle_scroll_range)
+        main_layout.addWidget(self.message_list)
+
+        if SHOW_MEMORY_GAUGE:
+            self.gauge_timer = QTimer(self)
+            self.gauge_timer.setSingleShot(True)
+            self.gauge_timer.setInterval(self.MEMORY_GAUGE_INTERVAL)
+            self.gauge_timer.timeout.connect(self.update_memory_gauge)
+            model = self.message_list.message_model
+            for signal in (model.rowsInserted, model.rowsRemoved,
+                           model.modelReset):
+                signal.connect(lambda *args: self.gauge_timer.start())
+            self.update_memory_gauge()
 
         input_container = QWidget()
+        input_container.setObjectName("ChatInputBar")
         input_container.setFixedHeight(70)
-        input_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 0.8);
-            border-top: 1px solid rgba(177, 156, 217, 0.3);
-        """)
 
         input_layout = QHBoxLayout(input_container)
         input_layout.setContentsMargins(15, 10, 15, 10)
         input_layout.setSpacing(10)
 
         self.message_input = RoundedLineEdit("Type your message...")
-        self.message_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #D8BFD8;
-            }
-        """)
         self.message_input.returnPressed.connect(self.send_message)
         input_layout.addWidget(self.message_input)
 
-        send_button_colors = {
-            "normal_top": QColor("#FF69B4"),
-            "normal_bottom": QColor("#FF1493"),
-            "hover_top": QColor("#FFB6C1"),
-            "hover_bottom": QColor("#FF69B4"),
-            "text": "#FFFFFF"
-        }
-
-        self.send_button = GradientButton("Send", send_button_colors)
+        self.send_button = GradientButton(
+            "Send", PINK, radius=10, size=(100, 44), font_size=11)
         self.send_button.clicked.connect(self.send_message)
         input_layout.addWidget(self.send_button)
 
@@ -225,69 +166,249 @@ class ChatWindow(QWidget):
         self.connect_websocket()
 
     def load_previous_chats(self):
-        """Load the previous chats between the two users"""
-        try:
-            uri = f"{SERVER}/api/chats/messages"
-            encrypted_current_username = encrypt(self.current_username)
-            compressed_current_username = compress(encrypted_current_username)
-            encrypted_chat_username = encrypt(self.chat_username)
-            compressed_chat_username = compress(encrypted_chat_username)
-            params = {"senderUsername": compressed_current_username,
-                      "receiverUsername": compressed_chat_username}
-            response = requests.get(uri, params=params, timeout=10000)
-            response.raise_for_status()
-
-            response_data = {}
-            if response.content:
-                try:
-                    response_data = response.json()
-                except json.JSONDecodeError:
-                    print("Response is not valid JSON")
-                    self.add_message(
-                        "System", "Invalid response from server", "Now", False)
-                    return
-            else:
-                print("No body received")
-                self.add_message(
-                    "System", "No messages received from server", "Now", False)
-                return
-
-            if response.status_code == 200:
-                messages = response_data.get("messages", [])
-                if not messages:
-                    self.add_message(
-                        "System", "No previous messages found", "Now", False)
-                    return
-
-                for message in messages:
-                    encrypted_sender = decompress(message.get(
-                        "sender", {}).get("username", "Unknown"))
-                    sender = decrypt(encrypted_sender)
-                    encrypted_text = decompress(message.get("text", ""))
-                    text = decrypt(encrypted_text)
-                    time_str = message.get("time", "Unknown")
-                    formatted_time_str = formatDate(time_str)
-                    is_own_message = (sender == self.current_username)
-                    self.add_message(
-                        sender, text, formatted_time_str, is_own_message)
-
-            else:
-                error = response_data.get("error", "Unknown error")
-                self.add_message("System", f"Error loading messages: {
-                                 error}", "Now", False)
-
-        except requests.exceptions.RequestException as e:
+        """Show the newest cached page, then fetch newer messages"""
+        cached = self.history_sync.older_than(
+            self.history_key, None, HISTORY_PAGE_SIZE)
+        if cached:
+            self.add_history_batch(("append", self.history_sync.decode(
+                self.history_key, cached, self.history_decoder)))
+
+        history_key = self.history_key
+        since = self.history_sync.cursor(history_key)
+        params = {"senderUsername": self.compressed_current_username,
+                  "receiverUsername": self.compressed_chat_username}
+        params.update(self.history_sync.request_params(
+            history_key, HISTORY_PAGE_SIZE))
+        self.history_request = ApiClient.instance().get(
+            "/api/chats/messages", params=params,
+            parse=lambda response, request: self.decode_history(
+                response, request, history_key, since))
+        self.history_request.progress.connect(self.add_history_batch)
+        self.history_request.succeeded.connect(self.handle_history_loaded)
+        self.history_request.failed.connect(self.handle_history_error)
+
+    def load_older_messages(self):
+        """Show the page of history above the oldest message on screen"""
+        if self.history_request or self.oldest_shown is None:
+            return
+
+        cached = self.history_sync.older_than(
+            self.history_key, self.oldest_shown, HISTORY_PAGE_SIZE)
+        if cached:
+            self.add_history_batch(("prepend", self.history_sync.decode(
+                self.history_key, cached, self.history_decoder)))
+            return
+        if not self.history_sync.is_stored(self.history_key, self.oldest_shown):
+            self.load_evicted_messages()
+            return
+        if self.history_sync.is_complete(self.history_key):
+            return
+
+        history_key = self.history_key
+        anchor = self.oldest_shown
+        before = self.history_sync.oldest(history_key)
+        params = {"senderUsername": self.compressed_current_username,
+                  "receiverUsername": self.compressed_chat_username,
+                  "before": before, "limit": HISTORY_PAGE_SIZE}
+        self.history_request = ApiClient.instance().get(
+            "/api/chats/messages", params=params,
+            parse=lambda response, request: self.decode_older_history(
+                response, request, history_key, before, anchor))
+        self.history_request.progress.connect(self.add_history_batch)
+        self.history_request.succeeded.connect(self.handle_history_loaded)
+        self.history_request.failed.connect(self.handle_history_error)
+
+    def load_evicted_messages(self):
+        """Fetch the page above an evicted live message from the server"""
+        history_key = self.history_key
+        anchor = self.oldest_shown
+        params = {"senderUsername": self.compressed_current_username,
+                  "receiverUsername": self.compressed_chat_username,
+                  "before": anchor[0], "limit": HISTORY_PAGE_SIZE}
+        self.history_request = ApiClient.instance().get(
+            "/api/chats/messages", params=params,
+            parse=lambda response, request: self.decode_evicted_history(
+                response, request, history_key, anchor))
+        self.history_request.progress.connect(self.add_history_batch)
+        self.history_request.succeeded.connect(self.handle_history_loaded)
+        self.history_request.failed.connect(self.handle_history_error)
+
+    def parse_history(self, response):
+        """Return (messages, notice) from a history response"""
+        response.raise_for_status()
+
+        if not response.content:
+            print("No body received")
+            return [], "No messages received from server"
+        response_data = response.json()
+
+        if response.status_code != 200:
+            error = response_data.get("error", "Unknown error")
+            return [], f"Error loading messages: {error}"
+        return response_data.get("messages", []), None
+
+    def decode_history(self, response, request, history_key, since):
+        """Merge and decode the newest messages on the worker thread.
+
+        Only the page that will be shown is decoded. It is sent to the GUI
+        through request.report() as (mode, entries); the return value is a
+        notice to show, if any.
+        """
+        messages, notice = self.parse_history(response)
+        if notice:
+            return notice
+
+        reset, messages = self.history_sync.merge_newer(
+            history_key, since, messages, HISTORY_PAGE_SIZE)
+        if not messages:
+            return "No previous messages found" if since is None else None
+
+        entries = self.history_sync.decode(
+            history_key, messages, self.history_decoder)
+        if not request.cancelled:
+            request.report(("reset" if reset else "append", entries))
+        return None
+
+    def decode_older_history(self, response, request, history_key, before,
+                             anchor):
+        """Merge and decode an older page of history on the worker thread"""
+        messages, notice = self.parse_history(response)
+        if notice:
+            return notice
+
+        messages = self.history_sync.merge_older(
+            history_key, before, messages, HISTORY_PAGE_SIZE, anchor)
+        if messages and not request.cancelled:
+            request.report(("prepend", self.history_sync.decode(
+                history_key, messages, self.history_decoder)))
+        return None
+
+    def decode_evicted_history(self, response, request, history_key, anchor):
+        """Decode the page above an evicted message without storing it"""
+        messages, notice = self.parse_history(response)
+        if notice:
+            return notice
+
+        messages = self.history_sync.page_before(
+            messages, anchor, HISTORY_PAGE_SIZE)
+        if messages and not request.cancelled:
+            request.report(("prepend", self.history_sync.decode(
+                history_key, messages, self.history_decoder)))
+        return None
+
+    def history_rows(self, entries):
+        """Turn decoded history entries into add_message arguments"""
+        rows = []
+        for message, sender, text in entries:
+            time_str = message.get("time", "Unknown")
+            rows.append((sender, text, formatDate(time_str),
+                         sender == self.current_username,
+                         self.history_sync.identity(message)))
+        return rows
+
+    def add_history_batch(self, batch):
+        """Render a page of decoded history.
+
+        "append" adds it below the messages on screen, "reset" replaces
+        them and "prepend" adds it on top without moving the messages the
+        user is looking at.
+        """
+        mode, entries = batch
+        if not entries:
+            return
+        if mode == "reset":
+            self.clear_messages()
+        if mode != "append" or self.oldest_shown is None:
+            self.oldest_shown = self.history_sync.identity(entries[0][0])
+
+        rows = self.history_rows(entries)
+        if mode != "prepend":
+            self.add_messages(rows)
+            return
+
+        scroll_bar = self.message_list.verticalScrollBar()
+        self.scroll_anchor = scroll_bar.maximum() - scroll_bar.value()
+        self.message_list.prepend_messages(rows)
+
+    def handle_scroll(self, value):
+        """Load older history at the top, trim the window at the bottom"""
+        scroll_bar = self.message_list.verticalScrollBar()
+        if (self.scroll_anchor is not None and
+                value != scroll_bar.maximum() - self.scroll_anchor):
+            self.scroll_anchor = None
+        if value == scroll_bar.minimum() and scroll_bar.maximum() > 0:
+            self.load_older_messages()
+        elif value == scroll_bar.maximum():
+            self.trim_messages()
+
+    def handle_scroll_range(self, minimum, maximum):
+        """Keep the view still while older messages are laid out above it"""
+        if self.scroll_anchor is not None:
+            self.message_list.verticalScrollBar().setValue(
+                maximum - self.scroll_anchor)
+
+    def clear_messages(self):
+        """Remove every message shown in the chat"""
+        self.message_list.clear_messages()
+        self.pending_messages.clear()
+        self.pending_by_text.clear()
+        self.oldest_shown = None
+        self.evicted = 0
+
+    def trim_messages(self):
+        """Evict the oldest messages once the window is over its cap.
+
+        Only done while the view is at the bottom and no page of history
+        is being loaded, since that page is placed above the oldest row.
+        """
+        count = self.message_list.message_model.rowCount()
+        scroll_bar = self.message_list.verticalScrollBar()
+        if (count <= self.window_size or self.history_request or
+                scroll_bar.value() != scroll_bar.maximum()):
+            return
+        evict = count - self.window_size + HISTORY_PAGE_SIZE
+        self.oldest_shown = self.message_list.evict_oldest(evict)
+        self.evicted += evict
+
+    def memory_usage(self):
+        """Approximate bytes held for the messages of this window"""
+        return self.message_list.memory_usage()
+
+    def update_memory_gauge(self):
+        """Show how many messages the window holds and their rough size"""
+        count = self.message_list.message_model.rowCount()
+        kilobytes = self.memory_usage() / 1024
+        self.memory_gauge.setText(f"{count} msgs · {kilobytes:.0f} KB")
+        self.memory_gauge.setToolTip(
+            f"{count} of at most {self.window_size} messages in memory, "
+            f"{self.evicted} evicted")
+
+    def handle_history_loaded(self, notice):
+        """Finish loading the history, showing any notice from the server"""
+        self.history_request = None
+        self.trim_messages()
+        if notice:
+            self.add_message("System", notice, "Now", False)
+
+    def handle_history_error(self, error):
+        """Report a failed history request"""
+        import requests
+        self.history_request = None
+        self.trim_messages()
+        if isinstance(error, json.JSONDecodeError):
+            print("Response is not valid JSON")
+            self.add_message(
+                "System", "Invalid response from server", "Now", False)
+        elif isinstance(error, requests.exceptions.RequestException):
             self.add_message("System", f"Network error: {
-                             str(e)}", "Now", False)
-        except Exception as e:
-            self.add_message("System", f"Error: {str(e)}", "Now", False)
-            print(str(e))
+                             str(error)}", "Now", False)
+        else:
+            self.add_message("System", f"Error: {str(error)}", "Now", False)
+            print(str(error))
 
     def connect_websocket(self):
         """Connect to WebSocket server"""
-        encrypted_chat_username = encrypt(self.chat_username)
-        compressed_chat_username = compress(encrypted_chat_username)
-        if not self.websocket_client.connect(compressed_chat_username):
+        if not self.websocket_client.connect():
             self.add_message(
                 "System",
                 "Failed to connect to chat server. Messages may not be delivered.",
@@ -296,83 +417,122 @@ class ChatWindow(QWidget):
             )
 
     def handle_websocket_message(self, data):
-        """Handle incoming WebSocket messages"""
+        """Handle WebSocket frames routed to this conversation.
+
+        The connection manager only routes frames of this conversation here,
+        so the sender is known and only the message body is decrypted.
+        """
         print(f"Handling WebSocket message: {data}")
-        if data.get("status") == "welcome":
-            return
         if data.get("status") == "delivered":
-            encrypted_sender = decompress(data.get("sender", ""))
-            sender = decrypt(encrypted_sender)
-            encrypted_receiver = decompress(data.get("receiver", ""))
-            receiver = decrypt(encrypted_receiver)
-            encrypted_message = decompress(data.get("message", ""))
-            message = decrypt(encrypted_message)
-            time_str = data.get("time", "Now")
-            formatted_time_str = formatDate(time_str)
-
-            if (sender == self.current_username and
-                receiver == self.chat_username and
-                    message in self.pending_messages):
-
-                message_widget = self.pending_messages[message]
-                if hasattr(message_widget, 'time_label'):
-                    message_widget.time_label.setText(time_str)
-
-                del self.pending_messages[message]
-                self.connection_status.setStyleSheet(
-                    "color: #4ECDC4; background: transparent;")
+            pending = self.pop_pending(self.receipt_message_id(data))
+            if pending is not None:
+                message_handle, text = pending
+                self.message_list.set_time(
+                    message_handle, formatDate(data.get("time", "Now")))
+                self.message_list.set_key(
+                    message_handle, self.history_sync.frame_identity(
+                        data, self.compressed_current_username, text))
+                set_state(self.connection_status, "connected")
                 self.connection_status.setToolTip("Message delivered")
 
-        elif (decrypt(decompress(data.get("sender", ""))) == self.chat_username and
-              decrypt(decompress(data.get("receiver", ""))) == self.current_username and
-              data.get("status") != "delivered"):
-            encrypted_sender = decompress(data.get("sender", ""))
-            sender = decrypt(encrypted_sender)
+        else:
             encrypted_message = decompress(data.get("message", ""))
             message = decrypt(encrypted_message)
             time_str = data.get("time", "Now")
             formatted_time_str = formatDate(time_str)
-            self.add_message(sender, message, formatted_time_str, False)
+            self.queue_message(self.chat_username, message,
+                               formatted_time_str, False,
+                               self.history_sync.frame_identity(data))
+
+    def receipt_message_id(self, data):
+        """Return the ID of the sent message a delivery receipt is for.
+
+        Servers that do not echo message IDs are matched on the ciphertext
+        instead, oldest message first; the fixed key and IV make equal
+        messages encrypt alike.
+        """
+        if self.websocket_client.server_receipt_ids:
+            return data.get("id")
+        message_ids = self.pending_by_text.get(data.get("message"))
+        return message_ids[0] if message_ids else None
+
+    def pop_pending(self, message_id):
+        """Forget a sent message; return its (handle, ciphertext) or None"""
+        pending = self.pending_messages.pop(message_id, None)
+        if pending is not None:
+            message_ids = self.pending_by_text[pending[1]]
+            message_ids.remove(message_id)
+            if not message_ids:
+                del self.pending_by_text[pending[1]]
+        return pending
+
+    def handle_delivery_failed(self, message_id):
+        """Mark a sent message whose receipt never arrived"""
+        pending = self.pop_pending(message_id)
+        if pending is None:
+            return
+        self.message_list.set_time(pending[0], "Not delivered")
+        set_state(self.connection_status, "disconnected")
+        self.connection_status.setToolTip("Message not delivered")
 
     def update_connection_status(self, status, tooltip):
         """Update the connection status indicator"""
-        color_map = {
-            "connected": "#4ECDC4",
-            "connecting": "#FFD93D",
-            "disconnected": "#FF6B6B"
-        }
-
-        color = color_map.get(status, "#FF6B6B")
-        self.connection_status.setStyleSheet(
-            f"color: {color}; background: transparent;")
+        if status not in ("connected", "connecting"):
+            status = "disconnected"
+        set_state(self.connection_status, status)
         self.connection_status.setToolTip(tooltip)
 
     def handle_websocket_error(self, error_message):
-        """Handle WebSocket errors"""
-        self.add_message("System", f"Connection error: {
-                         error_message}", "Now", False)
-        self.connection_status.setStyleSheet(
-            "color: #FF6B6B; background: transparent;")
+        """Handle WebSocket errors.
+
+        The notice only scrolls the chat if it was already at the bottom,
+        so it does not pull a reader out of older history.
+        """
+        self.flush_live_messages()
+        scroll_bar = self.message_list.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.message_list.add_message(
+            "System", f"Connection error: {error_message}", "Now", False)
+        if at_bottom:
+            self.scroll_to_bottom()
+        set_state(self.connection_status, "disconnected")
         self.connection_status.setToolTip(f"Error: {error_message}")
 
     def add_message(self, username, message, time, is_own_message):
-        """Add a message to the chat"""
-        message_widget = MessageWidget(
-            username, message, time, is_own_message, self)
-        self.messages_layout.insertWidget(
-            self.messages_layout.count() - 1, message_widget)
+        """Add a message to the chat, returning a handle to update its time"""
+        self.flush_live_messages()
+        message_handle = self.message_list.add_message(
+            username, message, time, is_own_message)
+        self.scroll_to_bottom()
+        return message_handle
 
-        if is_own_message and username == "You":
-            self.pending_messages[message] = message_widget
+    def add_messages(self, rows):
+        """Add (username, message, time, is_own[, key]) rows in one pass"""
+        self.flush_live_messages()
+        self.message_list.add_messages(rows)
+        self.scroll_to_bottom()
 
-        QApplication.processEvents()
+    def queue_message(self, username, message, time, is_own_message,
+                      key=None):
+        """Add a live message with the next frame's batch"""
+        self.live_messages.append(
+            (username, message, time, is_own_message, key))
+        if not self.live_timer.isActive():
+            self.live_timer.start()
+
+    def flush_live_messages(self):
+        """Add the queued live messages as one batch"""
+        self.live_timer.stop()
+        if not self.live_messages:
+            return
+        rows, self.live_messages = self.live_messages, []
+        self.message_list.add_messages(rows)
         self.scroll_to_bottom()
 
     def scroll_to_bottom(self):
-        """Scroll to the bottom of the chat"""
-        QTimer.singleShot(100, lambda: self.scroll_area.verticalScrollBar().setValue(
-            self.scroll_area.verticalScrollBar().maximum()
-        ))
+        """Scroll to the bottom once the pending insertions are laid out"""
+        if not self.scroll_timer.isActive():
+            self.scroll_timer.start()
 
     def send_message(self):
         """Send a message through the persistent WebSocket connection"""
@@ -380,32 +540,46 @@ class ChatWindow(QWidget):
         if not message or self.is_sending:
             return
 
-        self.add_message("You", message, "Delivered", True)
+        message_handle = self.add_message("You", message, "Sending...", True)
         self.message_input.clear()
 
-        self.connection_status.setStyleSheet(
-            "color: #FFD93D; background: transparent;")
+        set_state(self.connection_status, "connecting")
         self.connection_status.setToolTip("Sending message...")
         self.is_sending = True
 
         encrypted_message = encrypt(message)
         compressed_message = compress(encrypted_message)
-        encrypted_chat_username = encrypt(self.chat_username)
-        compressed_chat_username = compress(encrypted_chat_username)
-        if self.websocket_client.send_message(compressed_chat_username, compressed_message):
-            self.is_sending = False
+        message_id = self.websocket_client.send_message(
+            self.compressed_chat_username, compressed_message)
+        self.is_sending = False
+        if message_id:
+            self.pending_messages[message_id] = (
+                message_handle, compressed_message)
+            self.pending_by_text.setdefault(
+                compressed_message, []).append(message_id)
         else:
-            self.is_sending = False
+            self.message_list.set_time(message_handle, "Not delivered")
             self.add_message("System", "Failed to send message", "Now", False)
-            self.connection_status.setStyleSheet(
-                "color: #FF6B6B; background: transparent;")
+            set_state(self.connection_status, "disconnected")
             self.connection_status.setToolTip("Failed to send message")
 
     def close_chat(self):
         """Close chat window and WebSocket connection"""
+        if self.history_request:
+            self.history_request.cancel()
+            self.history_request = None
+        if self.running and hasattr(self, 'websocket_client'):
+            self.connection_manager.unsubscribe(
+                self.compressed_current_username, self.compressed_chat_username,
+                self.handle_websocket_message)
+            self.websocket_client.connection_status_changed.disconnect(
+                self.update_connection_status)
+            self.websocket_client.error_occurred.disconnect(
+                self.handle_websocket_error)
+            self.websocket_client.delivery_failed.disconnect(
+                self.handle_delivery_failed)
+            self.connection_manager.release(self.websocket_client)
         self.running = False
-        if hasattr(self, 'websocket_client'):
-            self.websocket_client.close()
         self.close()
         self.deleteLater()
 
@@ -1,12 +1,14 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTextEdit, QSizePolicy, QApplication, QScrollArea
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTextEdit, QSizePolicy, QApplication
 from PyQt5.QtGui import QFont, QPainter, QPainterPath, QLinearGradient, QColor, QPalette
 from PyQt5.QtCore import Qt
-import requests
 import json
-from components.chat_list_item import ChatListItem
+from components.chat_list_view import ChatListView
+from components.theme import set_role, set_state
 from views.chat import ChatWindow
-from config.config import SERVER
-from utils.crypt import encrypt, decrypt, compress, decompress
+from utils.api_client import ApiClient
+from utils.message_store import MessageStore
+from utils.crypt import (decrypt_many, decompress_many,
+                         encode_identifier, decode_identifier)
 
 
 class ChatList(QWidget):
@@ -14,7 +16,9 @@ class ChatList(QWidget):
         super().__init__()
         self.parent = parent
         self.chats_fetched = False
+        self.request = None
         self.open_chat_windows = {}
+        self.shown_chats = None
 
         self.setAutoFillBackground(True)
         palette = self.palette()
@@ -31,64 +35,31 @@ class ChatList(QWidget):
         title_label = QLabel("Your Conversations")
         title_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            color: #4B0082;
-            background: transparent;
-            padding: 10px;
-            margin-bottom: 5px;
-        """)
+        set_role(title_label, "title")
         self.main_layout.addWidget(title_label)
 
+        self.refresh_label = QLabel("Refreshing...")
+        self.refresh_label.setFont(QFont("Segoe UI", 9))
+        set_role(self.refresh_label, "hint")
+        self.refresh_label.setAlignment(Qt.AlignRight)
+        self.refresh_label.hide()
+        self.main_layout.addWidget(self.refresh_label)
+
         self.chats_error = QLabel("")
         self.chats_error.setFont(QFont("Segoe UI", 10))
-        self.chats_error.setStyleSheet("""
-            color: #FF4500;
-            background: transparent;
-            padding: 8px;
-            border-radius: 6px;
-            background-color: rgba(255, 69, 0, 0.1);
-        """)
+        set_role(self.chats_error, "notice")
         self.chats_error.setAlignment(Qt.AlignCenter)
         self.chats_error.setWordWrap(True)
         self.chats_error.hide()  # Initially hidden
         self.main_layout.addWidget(self.chats_error)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: rgba(177, 156, 217, 0.3);
-                width: 8px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: rgba(107, 91, 149, 0.5);
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: rgba(107, 91, 149, 0.7);
-            }
-        """)
-
-        self.chats_container = QWidget()
-        self.chats_layout = QVBoxLayout(self.chats_container)
-        self.chats_layout.setContentsMargins(5, 5, 5, 5)
-        self.chats_layout.setSpacing(12)
-        self.chats_layout.addStretch()
-
-        self.scroll_area.setWidget(self.chats_container)
-        self.main_layout.addWidget(self.scroll_area)
+        self.chat_view = ChatListView()
+        self.chat_view.chat_clicked.connect(self.handle_chat_clicked)
+        self.main_layout.addWidget(self.chat_view)
 
         self.loading_label = QLabel("Loading conversations...")
         self.loading_label.setFont(QFont("Segoe UI", 11))
-        self.loading_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(self.loading_label, "secondary")
         self.loading_label.setAlignment(Qt.AlignCenter)
         self.loading_label.hide()
         self.main_layout.addWidget(self.loading_label)
@@ -105,29 +76,50 @@ class ChatList(QWidget):
     def hideEvent(self, event):
         """Reset chats_fetched when widget is hidden to refresh on next show."""
         self.chats_fetched = False
+        if self.request:
+            self.request.cancel()
+            self.request = None
+            self.loading_label.hide()
+            self.refresh_label.hide()
         super().hideEvent(event)
 
     def get_chats(self):
-        """Fetch and display chats for the logged-in user."""
+        """Show the last known chats at once, then refresh them from the server.
+
+        The stored snapshot is drawn before the request is sent, so the list
+        is never blank while the network answers; a small indicator shows
+        that a refresh is in progress.
+        """
         username = self.parent.get_username()
         if not username:
             self.show_error("No user logged in")
             return
 
-        for i in reversed(range(self.chats_layout.count())):
-            item = self.chats_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
-
-        self.loading_label.show()
+        compressed_username = encode_identifier(username)
+        stored = MessageStore.instance().chats(compressed_username)
         self.chats_error.hide()
-
+        if stored:
+            self.show_chats([chat for chat, _ in stored],
+                            [plaintext for _, plaintext in stored], username)
+            self.refresh_label.show()
+        else:
+            self.clear_chats()
+            self.loading_label.show()
+
+        params = {"username": compressed_username}
+        if self.request:
+            self.request.cancel()
+        self.request = ApiClient.instance().get("/api/chats", params=params)
+        self.request.succeeded.connect(
+            lambda response: self.handle_chats_response(response, username))
+        self.request.failed.connect(self.handle_chats_error)
+
+    def handle_chats_response(self, response, username):
+        """Store and display the chats returned by the server."""
+        self.request = None
+        compressed_username = encode_identifier(username)
+        import requests
         try:
-            uri = f"{SERVER}/api/chats"
-            encrypted_username = encrypt(username)
-            compressed_username = compress(encrypted_username)
-            params = {"username": compressed_username}
-            response = requests.get(uri, params=params, timeout=10000)
             response.raise_for_status()
 
             response_data = {}
@@ -146,32 +138,22 @@ class ChatList(QWidget):
             if response.status_code == 200:
                 self.chats_error.hide()
                 chats = response_data.get("chats", [])
+                store = MessageStore.instance()
+                texts = [chat.get("text", "") for chat in chats]
+                known = {chat.get("text"): plaintext
+                         for chat, plaintext in store.chats(compressed_username)
+                         if plaintext is not None}
+                missing = [text for text in texts if text not in known]
+                known.update(zip(missing, decrypt_many(decompress_many(missing))))
+                messages = [known[text] for text in texts]
+                store.replace_chats(compressed_username, chats, messages)
+
                 if not chats:
+                    self.clear_chats()
                     self.show_info(
                         "No conversations yet. Start a new chat to begin!")
                     return
-
-                for chat in chats:
-                    display_username = (
-                        chat.get("receiver", {}).get("username", "Unknown")
-                        if chat.get("sender", {}).get("username") == compressed_username
-                        else chat.get("sender", {}).get("username", "Unknown")
-                    )
-                    encrypted_display_username = decompress(display_username)
-                    decrypted_display_username = decrypt(
-                        encrypted_display_username)
-                    encrypted_message = decompress(chat.get("text", ""))
-                    decrypted_message = decrypt(encrypted_message)
-                    chat_item = ChatListItem(
-                        username=decrypted_display_username,
-                        message=decrypted_message,
-                        time=chat.get("time", ""),
-                        current_username=username,
-                        parent=self
-                    )
-                    chat_item.clicked.connect(self.open_chat)
-                    self.chats_layout.insertWidget(
-                        self.chats_layout.count() - 1, chat_item)
+                self.show_chats(chats, messages, username)
 
             else:
                 error = response_data.get("error", "Unknown error")
@@ -186,6 +168,58 @@ class ChatList(QWidget):
             self.show_error("Invalid response from server")
         finally:
             self.loading_label.hide()
+            self.refresh_label.hide()
+
+    def clear_chats(self):
+        """Remove every conversation from the list."""
+        self.shown_chats = None
+        self.chat_view.clear_chats()
+
+    def show_chats(self, chats, messages, username):
+        """Reconcile the list with the given chats and decrypted messages.
+
+        Rows are keyed by the other participant, so a refresh only updates,
+        moves, adds or removes the rows that differ.
+        """
+        snapshot = (username, [
+            (chat.get("sender", {}).get("username"),
+             chat.get("receiver", {}).get("username"),
+             chat.get("text"), chat.get("time"))
+            for chat in chats])
+        if snapshot == self.shown_chats:
+            return
+        if self.shown_chats is not None and self.shown_chats[0] != username:
+            self.clear_chats()
+        self.shown_chats = snapshot
+
+        compressed_username = encode_identifier(username)
+        rows = {}
+        for chat, decrypted_message in zip(chats, messages):
+            display_username = (
+                chat.get("receiver", {}).get("username", "Unknown")
+                if chat.get("sender", {}).get("username") == compressed_username
+                else chat.get("sender", {}).get("username", "Unknown")
+            )
+            if display_username not in rows:
+                rows[display_username] = (
+                    display_username, decode_identifier(display_username),
+                    decrypted_message, chat.get("time", ""))
+        self.chat_view.set_chats(list(rows.values()))
+
+    def handle_chat_clicked(self, chat_username):
+        """Open the conversation clicked in the list."""
+        self.open_chat(chat_username, self.parent.get_username())
+
+    def handle_chats_error(self, error):
+        """Report a failed chat list request."""
+        self.request = None
+        self.loading_label.hide()
+        self.refresh_label.hide()
+        if self.shown_chats:
+            self.show_error(
+                f"Showing saved conversations. Network error: {str(error)}")
+        else:
+            self.show_error(f"Network error: {str(error)}")
 
     def open_chat(self, chat_username, current_username):
         """Open a chat window for the selected conversation"""
@@ -209,23 +243,11 @@ class ChatList(QWidget):
     def show_error(self, message):
         """Display error message with appropriate styling"""
         self.chats_error.setText(message)
-        self.chats_error.setStyleSheet("""
-            color: #FF4500;
-            background: transparent;
-            padding: 8px;
-            border-radius: 6px;
-            background-color: rgba(255, 69, 0, 0.1);
-        """)
+        set_state(self.chats_error, "error")
         self.chats_error.show()
 
     def show_info(self, message):
         """Display informational message with different styling"""
         self.chats_error.setText(message)
-        self.chats_error.setStyleSheet("""
-            color: #2E8B57;
-            background: transparent;
-            padding: 8px;
-            border-radius: 6px;
-            background-color: rgba(46, 139, 87, 0.1);
-        """)
+        set_state(self.chats_error, "success")
         self.chats_error.show()
@@ -1,78 +1,22 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSizePolicy
-from PyQt5.QtGui import QFont, QPainter, QPainterPath, QLinearGradient, QColor, QPalette
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QSizePolicy
+from PyQt5.QtGui import QFont, QLinearGradient, QColor, QPalette
 from PyQt5.QtCore import Qt
-import requests
 import json
+from utils.api_client import ApiClient
 from utils.ip_utils import get_local_ip
-from utils.crypt import encrypt, compress
-from config.config import SERVER
-
-
-class RoundedLineEdit(QLineEdit):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setMinimumSize(240, 44)
-        self.setFont(QFont("Segoe UI", 10))
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(Qt.NoPen)
-
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, self.width(), self.height(), 10, 10)
-
-        if self.hasFocus():
-            painter.setPen(QColor("#FF69B4"))
-            painter.setBrush(Qt.NoBrush)
-        else:
-            painter.setPen(QColor("#FFB6C1"))
-            painter.setBrush(Qt.NoBrush)
-
-        painter.drawPath(path)
-
-
-class GradientButton(QPushButton):
-    def __init__(self, text, color_scheme, parent=None):
-        super().__init__(text, parent)
-        self.color_scheme = color_scheme
-        self.setCursor(Qt.PointingHandCursor)
-        self.setMinimumSize(140, 48)
-        self.setFont(QFont("Segoe UI", 12, QFont.Bold))
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        path = QPainterPath()
-        path.addRoundedRect(2, 2, self.width()-4, self.height()-4, 12, 12)
-
-        gradient = QLinearGradient(0, 0, 0, self.height())
-
-        if self.isEnabled():
-            if self.underMouse():
-                gradient.setColorAt(0, self.color_scheme["hover_top"])
-                gradient.setColorAt(1, self.color_scheme["hover_bottom"])
-            else:
-                gradient.setColorAt(0, self.color_scheme["normal_top"])
-                gradient.setColorAt(1, self.color_scheme["normal_bottom"])
-        else:
-            gradient.setColorAt(0, QColor("#D3D3D3"))
-            gradient.setColorAt(1, QColor("#C0C0C0"))
-
-        painter.fillPath(path, gradient)
-
-        painter.setPen(QColor(self.color_scheme["text"]))
-        painter.setFont(self.font())
-        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+from utils.crypt import encrypt, compress, encode_identifier
+from components.theme import set_role, set_state
+from components.widgets import (GradientButton, RoundedLineEdit, PINK,
+                               PINK_BORDER)
 
 
 class LoginWindow(QWidget):
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
+        self.request = None
+        self.pending_username = ""
+        self.setObjectName("LoginWindow")
 
         self.setAutoFillBackground(True)
         palette = self.palette()
@@ -89,95 +33,59 @@ class LoginWindow(QWidget):
         title_label = QLabel("Welcome Back")
         title_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            color: #4B0082;
-            background: transparent;
-            padding: 5px;
-            margin-bottom: 10px;
-        """)
+        set_role(title_label, "title")
         main_layout.addWidget(title_label)
 
         subtitle_label = QLabel("Sign in to continue chatting")
         subtitle_label.setFont(QFont("Segoe UI", 10))
         subtitle_label.setAlignment(Qt.AlignCenter)
-        subtitle_label.setStyleSheet(
-            "color: #9370DB; background: transparent; margin-bottom: 15px;")
+        set_role(subtitle_label, "subtitle")
         main_layout.addWidget(subtitle_label)
 
         form_container = QWidget()
-        form_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 0.7);
-            border-radius: 12px;
-            border: 1px solid rgba(255, 182, 193, 0.3);
-        """)
+        form_container.setObjectName("Card")
         form_layout = QVBoxLayout(form_container)
         form_layout.setContentsMargins(20, 20, 20, 20)
         form_layout.setSpacing(15)
 
         username_label = QLabel("Username")
         username_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        username_label.setStyleSheet(
-            "color: #FF69B4; background: transparent;")
+        set_role(username_label, "secondary")
         form_layout.addWidget(username_label)
 
-        self.username_input = RoundedLineEdit()
+        self.username_input = RoundedLineEdit(
+            radius=10, border=PINK_BORDER, font_size=10, min_width=240)
         self.username_input.setPlaceholderText("Enter your username")
-        self.username_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #FFB6C1;
-            }
-        """)
         form_layout.addWidget(self.username_input)
 
         self.username_error = QLabel("")
         self.username_error.setFont(QFont("Segoe UI", 9))
-        self.username_error.setStyleSheet(
-            "color: #FF4500; background: transparent;")
+        set_role(self.username_error, "status")
         self.username_error.setAlignment(Qt.AlignLeft)
         self.username_error.setWordWrap(True)
         form_layout.addWidget(self.username_error)
 
         password_label = QLabel("Password")
         password_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        password_label.setStyleSheet(
-            "color: #FF69B4; background: transparent;")
+        set_role(password_label, "secondary")
         form_layout.addWidget(password_label)
 
-        self.password_input = RoundedLineEdit()
+        self.password_input = RoundedLineEdit(
+            radius=10, border=PINK_BORDER, font_size=10, min_width=240)
         self.password_input.setEchoMode(QLineEdit.Password)
         self.password_input.setPlaceholderText("Enter your password")
-        self.password_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #FFB6C1;
-            }
-        """)
         form_layout.addWidget(self.password_input)
 
         self.password_error = QLabel("")
         self.password_error.setFont(QFont("Segoe UI", 9))
-        self.password_error.setStyleSheet(
-            "color: #FF4500; background: transparent;")
+        set_role(self.password_error, "status")
         self.password_error.setAlignment(Qt.AlignLeft)
         self.password_error.setWordWrap(True)
         form_layout.addWidget(self.password_error)
 
         main_layout.addWidget(form_container)
 
-        button_colors = {
-            "normal_top": QColor("#FF69B4"),
-            "normal_bottom": QColor("#FF1493"),
-            "hover_top": QColor("#FFB6C1"),
-            "hover_bottom": QColor("#FF69B4"),
-            "text": "#FFFFFF"
-        }
-
-        loginButton = GradientButton("Sign In", button_colors, self)
+        loginButton = GradientButton("Sign In", PINK, self)
         loginButton.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         loginButton.clicked.connect(self.login)
         main_layout.addWidget(loginButton, alignment=Qt.AlignCenter)
@@ -189,6 +97,7 @@ class LoginWindow(QWidget):
     def login(self):
         self.username_error.setText("")
         self.password_error.setText("")
+        set_state(self.password_error, "error")
         username = self.username_input.text().strip()
         password = self.password_input.text().strip()
         ip = get_local_ip()
@@ -199,8 +108,7 @@ class LoginWindow(QWidget):
             self.password_error.setText("Password cannot be empty.")
             return
 
-        encrypted_username = encrypt(username)
-        compressed_username = compress(encrypted_username)
+        compressed_username = encode_identifier(username)
         encrypted_password = encrypt(password)
         compressed_password = compress(encrypted_password)
 
@@ -210,9 +118,18 @@ class LoginWindow(QWidget):
             "ip": ip
         }
 
+        self.pending_username = username
+        if self.request:
+            self.request.cancel()
+        self.request = ApiClient.instance().post(
+            "/api/users/login", json=data)
+        self.request.succeeded.connect(self.handle_login_response)
+        self.request.failed.connect(self.handle_login_error)
+
+    def handle_login_response(self, response):
+        self.request = None
+        import requests
         try:
-            uri = f"{SERVER}/api/users/login"
-            response = requests.post(uri, json=data, timeout=10000)
             response.raise_for_status()
             response_data = {}
 
@@ -225,13 +142,12 @@ class LoginWindow(QWidget):
                 print("No body received")
 
             if response.status_code == 200:
-                self.parent.set_username(username)
+                self.parent.set_username(self.pending_username)
                 self.username_input.clear()
                 self.password_input.clear()
                 self.username_error.setText("")
                 self.password_error.setText("✓ Login successful!")
-                self.password_error.setStyleSheet(
-                    "color: #2E8B57; background: transparent;")
+                set_state(self.password_error, "success")
                 self.parent.show_home()
             else:
                 error = response_data.get("error", "Unknown error")
@@ -247,3 +163,15 @@ class LoginWindow(QWidget):
         except json.JSONDecodeError:
             self.username_error.setText("Invalid response from server")
             self.password_error.setText("")
+
+    def handle_login_error(self, error):
+        self.request = None
+        self.username_error.setText("Network error")
+        self.password_error.setText(str(error))
+
+    def hideEvent(self, event):
+        """Cancel a request still in flight when the view is hidden"""
+        if self.request:
+            self.request.cancel()
+            self.request = None
+        super().hideEvent(event)
@@ -1,71 +1,12 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSizePolicy
-from PyQt5.QtGui import QFont, QPainter, QPainterPath, QLinearGradient, QColor, QPalette
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QSizePolicy
+from PyQt5.QtGui import QFont, QLinearGradient, QColor, QPalette
 from PyQt5.QtCore import Qt
-import requests
 import json
-from config.config import SERVER
-from utils.crypt import encrypt, decrypt, compress, decompress
-
-
-class RoundedLineEdit(QLineEdit):
-    def __init__(self, placeholder="", parent=None):
-        super().__init__(parent)
-        self.setMinimumHeight(44)
-        self.setFont(QFont("Segoe UI", 11))
-        self.setPlaceholderText(placeholder)
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(Qt.NoPen)
-
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, self.width(), self.height(), 12, 12)
-
-        if self.hasFocus():
-            painter.setPen(QColor("#7B68EE"))
-        else:
-            painter.setPen(QColor("#D8BFD8"))
-
-        painter.setBrush(Qt.NoBrush)
-        painter.drawPath(path)
-
-
-class GradientButton(QPushButton):
-    def __init__(self, text, color_scheme, parent=None):
-        super().__init__(text, parent)
-        self.color_scheme = color_scheme
-        self.setCursor(Qt.PointingHandCursor)
-        self.setMinimumSize(140, 48)
-        self.setFont(QFont("Segoe UI", 11, QFont.Bold))
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        path = QPainterPath()
-        path.addRoundedRect(2, 2, self.width()-4, self.height()-4, 12, 12)
-
-        gradient = QLinearGradient(0, 0, 0, self.height())
-
-        if self.isEnabled():
-            if self.underMouse():
-                gradient.setColorAt(0, self.color_scheme["hover_top"])
-                gradient.setColorAt(1, self.color_scheme["hover_bottom"])
-            else:
-                gradient.setColorAt(0, self.color_scheme["normal_top"])
-                gradient.setColorAt(1, self.color_scheme["normal_bottom"])
-        else:
-            gradient.setColorAt(0, QColor("#D3D3D3"))
-            gradient.setColorAt(1, QColor("#C0C0C0"))
-
-        painter.fillPath(path, gradient)
-
-        painter.setPen(QColor(self.color_scheme["text"]))
-        painter.setFont(self.font())
-        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+from utils.api_client import ApiClient
+from utils.crypt import encrypt, compress, encode_identifier
+from components.theme import set_role
+from components.widgets import (GradientButton, RoundedLineEdit, LILAC, PINK,
+                               PURPLE, VIOLET)
 
 
 class Profile(QWidget):
@@ -73,6 +14,9 @@ class Profile(QWidget):
         super().__init__()
         self.parent = parent
         self.edit_mode = None
+        self.request = None
+        self.pending_username = ""
+        self.setObjectName("Profile")
 
         self.setAutoFillBackground(True)
         palette = self.palette()
@@ -89,66 +33,38 @@ class Profile(QWidget):
         title_label = QLabel("Your Profile")
         title_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(
-            "color: #4B0082; background: transparent; margin-bottom: 10px;")
+        set_role(title_label, "title")
         main_layout.addWidget(title_label)
 
         profile_container = QWidget()
-        profile_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 0.7);
-            border-radius: 16px;
-            border: 1px solid rgba(177, 156, 217, 0.3);
-        """)
+        profile_container.setObjectName("Card")
         self.profile_layout = QVBoxLayout(profile_container)
         self.profile_layout.setContentsMargins(25, 25, 25, 25)
         self.profile_layout.setSpacing(20)
 
         username_label = QLabel("Username")
         username_label.setFont(QFont("Segoe UI", 12, QFont.Medium))
-        username_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(username_label, "secondary")
         self.profile_layout.addWidget(username_label)
 
         # Initialize with placeholder, will be updated when shown
         self.username_display = QLabel("Loading...")
         self.username_display.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.username_display.setStyleSheet("""
-            color: #4B0082;
-            background: rgba(255, 255, 255, 0.8);
-            border-radius: 8px;
-            padding: 10px;
-            border: 1px solid rgba(177, 156, 217, 0.2);
-        """)
+        self.username_display.setObjectName("UsernameDisplay")
         self.username_display.setAlignment(Qt.AlignCenter)
         self.profile_layout.addWidget(self.username_display)
 
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(15)
 
-        edit_username_colors = {
-            "normal_top": QColor("#9370DB"),
-            "normal_bottom": QColor("#7B68EE"),
-            "hover_top": QColor("#A891D6"),
-            "hover_bottom": QColor("#9370DB"),
-            "text": "#FFFFFF"
-        }
-
         self.edit_username_btn = GradientButton(
-            "Edit Username", edit_username_colors, self)
+            "Edit Username", VIOLET, self, font_size=11)
         self.edit_username_btn.clicked.connect(
             lambda: self.show_edit_form("username"))
         buttons_layout.addWidget(self.edit_username_btn)
 
-        change_password_colors = {
-            "normal_top": QColor("#FF69B4"),
-            "normal_bottom": QColor("#FF1493"),
-            "hover_top": QColor("#FFB6C1"),
-            "hover_bottom": QColor("#FF69B4"),
-            "text": "#FFFFFF"
-        }
-
         self.change_password_btn = GradientButton(
-            "Change Password", change_password_colors, self)
+            "Change Password", PINK, self, font_size=11)
         self.change_password_btn.clicked.connect(
             lambda: self.show_edit_form("password"))
         buttons_layout.addWidget(self.change_password_btn)
@@ -173,54 +89,28 @@ class Profile(QWidget):
 
         new_username_label = QLabel("New Username")
         new_username_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        new_username_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(new_username_label, "secondary")
         username_form_layout.addWidget(new_username_label)
 
         self.new_username_input = RoundedLineEdit("Enter new username")
-        self.new_username_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #D8BFD8;
-            }
-        """)
         username_form_layout.addWidget(self.new_username_input)
 
         self.username_error = QLabel("")
         self.username_error.setFont(QFont("Segoe UI", 9))
-        self.username_error.setStyleSheet(
-            "color: #FF4500; background: transparent;")
+        set_role(self.username_error, "status")
         self.username_error.setWordWrap(True)
         username_form_layout.addWidget(self.username_error)
 
         username_buttons_layout = QHBoxLayout()
         username_buttons_layout.setSpacing(10)
 
-        cancel_colors = {
-            "normal_top": QColor("#D8BFD8"),
-            "normal_bottom": QColor("#C7A4C7"),
-            "hover_top": QColor("#E6E6FA"),
-            "hover_bottom": QColor("#D8BFD8"),
-            "text": "#4B0082"
-        }
-
         self.username_cancel_btn = GradientButton(
-            "Cancel", cancel_colors, self)
+            "Cancel", LILAC, self, font_size=11)
         self.username_cancel_btn.clicked.connect(self.hide_edit_form)
         username_buttons_layout.addWidget(self.username_cancel_btn)
 
-        save_colors = {
-            "normal_top": QColor("#7B68EE"),
-            "normal_bottom": QColor("#6A5ACD"),
-            "hover_top": QColor("#9370DB"),
-            "hover_bottom": QColor("#7B68EE"),
-            "text": "#FFFFFF"
-        }
-
         self.username_save_btn = GradientButton(
-            "Save Changes", save_colors, self)
+            "Save Changes", PURPLE, self, font_size=11)
         self.username_save_btn.clicked.connect(self.save_changes)
         username_buttons_layout.addWidget(self.username_save_btn)
 
@@ -233,44 +123,25 @@ class Profile(QWidget):
 
         current_password_label = QLabel("Current Password")
         current_password_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        current_password_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(current_password_label, "secondary")
         password_form_layout.addWidget(current_password_label)
 
         self.current_password_input = RoundedLineEdit("Enter current password")
         self.current_password_input.setEchoMode(QLineEdit.Password)
-        self.current_password_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #D8BFD8;
-            }
-        """)
         password_form_layout.addWidget(self.current_password_input)
 
         new_password_label = QLabel("New Password")
         new_password_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        new_password_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(new_password_label, "secondary")
         password_form_layout.addWidget(new_password_label)
 
         self.new_password_input = RoundedLineEdit("Enter new password")
         self.new_password_input.setEchoMode(QLineEdit.Password)
-        self.new_password_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #D8BFD8;
-            }
-        """)
         password_form_layout.addWidget(self.new_password_input)
 
         self.password_error = QLabel("")
         self.password_error.setFont(QFont("Segoe UI", 9))
-        self.password_error.setStyleSheet(
-            "color: #FF4500; background: transparent;")
+        set_role(self.password_error, "status")
         self.password_error.setWordWrap(True)
         password_form_layout.addWidget(self.password_error)
 
@@ -278,12 +149,12 @@ class Profile(QWidget):
         password_buttons_layout.setSpacing(10)
 
         self.password_cancel_btn = GradientButton(
-            "Cancel", cancel_colors, self)
+            "Cancel", LILAC, self, font_size=11)
         self.password_cancel_btn.clicked.connect(self.hide_edit_form)
         password_buttons_layout.addWidget(self.password_cancel_btn)
 
         self.password_save_btn = GradientButton(
-            "Save Changes", save_colors, self)
+            "Save Changes", PURPLE, self, font_size=11)
         self.password_save_btn.clicked.connect(self.save_changes)
         password_buttons_layout.addWidget(self.password_save_btn)
 
@@ -352,11 +223,30 @@ class Profile(QWidget):
 
     def save_changes(self):
         """Save changes based on current edit mode"""
+        if self.request:
+            return
         if self.edit_mode == "username":
             self.update_username()
         else:
             self.update_password()
 
+    def start_request(self, path, params, on_response, on_error):
+        """Send a profile update in the background.
+
+        Updates change state on the server, so they are never cancelled:
+        their result is applied even if the view was hidden meanwhile, and
+        save_changes() ignores a new update until the last one finished.
+        """
+        self.request = ApiClient.instance().put(path, params=params)
+        self.request.succeeded.connect(on_response)
+        self.request.failed.connect(
+            lambda error: self.handle_request_error(error, on_error))
+
+    def handle_request_error(self, error, show_error):
+        """Show a failed profile update on the form that sent it"""
+        self.request = None
+        show_error(str(error))
+
     def update_username(self):
         """Update username via API"""
         new_username = self.new_username_input.text().strip()
@@ -370,15 +260,21 @@ class Profile(QWidget):
                 "New username cannot be the same as current username")
             return
 
+        compressed_old_username = encode_identifier(
+            self.parent.get_username())
+        compressed_new_username = encode_identifier(new_username)
+        params = {"oldUsername": compressed_old_username,
+                  "newUsername": compressed_new_username}
+        self.pending_username = new_username
+        self.start_request("/api/users/username", params,
+                           self.handle_username_response,
+                           self.username_error.setText)
+
+    def handle_username_response(self, response):
+        """Apply the username change once the server accepted it"""
+        self.request = None
+        new_username = self.pending_username
         try:
-            uri = f"{SERVER}/api/users/username"
-            encrypted_old_username = encrypt(self.parent.get_username())
-            compressed_old_username = compress(encrypted_old_username)
-            encrypted_new_username = encrypt(new_username)
-            compressed_new_username = compress(encrypted_new_username)
-            params = {"oldUsername": compressed_old_username,
-                      "newUsername": compressed_new_username}
-            response = requests.put(uri, params=params, timeout=10000)
             response.raise_for_status()
             response_data = {}
 
@@ -423,18 +319,22 @@ class Profile(QWidget):
                 "New password cannot be the same as current password")
             return
 
+        compressed_username = encode_identifier(self.parent.get_username())
+        encrypted_old_password = encrypt(current_password)
+        compressed_old_password = compress(encrypted_old_password)
+        encrypted_new_password = encrypt(new_password)
+        compressed_new_password = compress(encrypted_new_password)
+        params = {"username": compressed_username,
+                  "oldPassword": compressed_old_password,
+                  "newPassword": compressed_new_password}
+        self.start_request("/api/users/password", params,
+                           self.handle_password_response,
+                           self.password_error.setText)
+
+    def handle_password_response(self, response):
+        """Close the form once the server accepted the new password"""
+        self.request = None
         try:
-            uri = f"{SERVER}/api/users/password"
-            encrypted_username = encrypt(self.parent.get_username())
-            compressed_username = compress(encrypted_username)
-            encrypted_old_password = encrypt(current_password)
-            compressed_old_password = compress(encrypted_old_password)
-            encrypted_new_password = encrypt(new_password)
-            compressed_new_password = compress(encrypted_new_password)
-            params = {"username": compressed_username,
-                      "oldPassword": compressed_old_password,
-                      "newPassword": compressed_new_password}
-            response = requests.put(uri, params=params, timeout=10000)
             response.raise_for_status()
             response_data = {}
 
@@ -1,77 +1,19 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSizePolicy
-from PyQt5.QtGui import QFont, QPainter, QPainterPath, QLinearGradient, QColor, QPalette
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QSizePolicy
+from PyQt5.QtGui import QFont, QLinearGradient, QColor, QPalette
 from PyQt5.QtCore import Qt
-import requests
 import json
+from utils.api_client import ApiClient
 from utils.ip_utils import get_local_ip
-from config.config import SERVER
-from utils.crypt import encrypt, compress
-
-
-class RoundedLineEdit(QLineEdit):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setMinimumSize(240, 44)
-        self.setFont(QFont("Segoe UI", 10))
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(Qt.NoPen)
-
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, self.width(), self.height(), 10, 10)
-
-        if self.hasFocus():
-            painter.setPen(QColor("#7B68EE"))
-            painter.setBrush(Qt.NoBrush)
-        else:
-            painter.setPen(QColor("#D8BFD8"))
-            painter.setBrush(Qt.NoBrush)
-
-        painter.drawPath(path)
-
-
-class GradientButton(QPushButton):
-    def __init__(self, text, color_scheme, parent=None):
-        super().__init__(text, parent)
-        self.color_scheme = color_scheme
-        self.setCursor(Qt.PointingHandCursor)
-        self.setMinimumSize(140, 48)
-        self.setFont(QFont("Segoe UI", 12, QFont.Bold))
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        path = QPainterPath()
-        path.addRoundedRect(2, 2, self.width()-4, self.height()-4, 12, 12)
-
-        gradient = QLinearGradient(0, 0, 0, self.height())
-
-        if self.isEnabled():
-            if self.underMouse():
-                gradient.setColorAt(0, self.color_scheme["hover_top"])
-                gradient.setColorAt(1, self.color_scheme["hover_bottom"])
-            else:
-                gradient.setColorAt(0, self.color_scheme["normal_top"])
-                gradient.setColorAt(1, self.color_scheme["normal_bottom"])
-        else:
-            gradient.setColorAt(0, QColor("#D3D3D3"))
-            gradient.setColorAt(1, QColor("#C0C0C0"))
-
-        painter.fillPath(path, gradient)
-        painter.setPen(QColor(self.color_scheme["text"]))
-        painter.setFont(self.font())
-        painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+from utils.crypt import encrypt, compress, encode_identifier
+from components.theme import set_role, set_state
+from components.widgets import GradientButton, RoundedLineEdit, PURPLE
 
 
 class SignupWindow(QWidget):
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
+        self.request = None
 
         self.setAutoFillBackground(True)
         palette = self.palette()
@@ -88,88 +30,53 @@ class SignupWindow(QWidget):
         title_label = QLabel("Create Account")
         title_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("""
-            color: #4B0082;
-            background: transparent;
-            padding: 5px;
-            margin-bottom: 10px;
-        """)
+        set_role(title_label, "title")
         main_layout.addWidget(title_label)
 
         form_container = QWidget()
-        form_container.setStyleSheet("""
-            background: rgba(255, 255, 255, 0.7);
-            border-radius: 12px;
-            border: 1px solid rgba(177, 156, 217, 0.3);
-        """)
+        form_container.setObjectName("Card")
         form_layout = QVBoxLayout(form_container)
         form_layout.setContentsMargins(20, 20, 20, 20)
         form_layout.setSpacing(15)
 
         username_label = QLabel("Username")
         username_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        username_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(username_label, "secondary")
         form_layout.addWidget(username_label)
 
-        self.username_input = RoundedLineEdit()
+        self.username_input = RoundedLineEdit(
+            radius=10, font_size=10, min_width=240)
         self.username_input.setPlaceholderText("Enter your username")
-        self.username_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #D8BFD8;
-            }
-        """)
         form_layout.addWidget(self.username_input)
 
         self.username_error = QLabel("")
         self.username_error.setFont(QFont("Segoe UI", 9))
-        self.username_error.setStyleSheet(
-            "color: #FF4500; background: transparent;")
+        set_role(self.username_error, "status")
         self.username_error.setAlignment(Qt.AlignLeft)
         self.username_error.setWordWrap(True)
         form_layout.addWidget(self.username_error)
 
         password_label = QLabel("Password")
         password_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        password_label.setStyleSheet(
-            "color: #6A5ACD; background: transparent;")
+        set_role(password_label, "secondary")
         form_layout.addWidget(password_label)
 
-        self.password_input = RoundedLineEdit()
+        self.password_input = RoundedLineEdit(
+            radius=10, font_size=10, min_width=240)
         self.password_input.setEchoMode(QLineEdit.Password)
         self.password_input.setPlaceholderText("Enter your password")
-        self.password_input.setStyleSheet("""
-            QLineEdit {
-                background: #FFFFFF;
-                color: #4B0082;
-                padding: 8px 12px;
-                selection-background-color: #D8BFD8;
-            }
-        """)
         form_layout.addWidget(self.password_input)
 
         self.password_error = QLabel("")
         self.password_error.setFont(QFont("Segoe UI", 9))
-        self.password_error.setStyleSheet(
-            "color: #FF4500; background: transparent;")
+        set_role(self.password_error, "status")
         self.password_error.setAlignment(Qt.AlignLeft)
         self.password_error.setWordWrap(True)
         form_layout.addWidget(self.password_error)
 
         main_layout.addWidget(form_container)
 
-        button_colors = {
-            "normal_top": QColor("#7B68EE"),
-            "normal_bottom": QColor("#6A5ACD"),
-            "hover_top": QColor("#9370DB"),
-            "hover_bottom": QColor("#7B68EE"),
-            "text": "#FFFFFF"
-        }
-
-        signupButton = GradientButton("Create Account", button_colors, self)
+        signupButton = GradientButton("Create Account", PURPLE, self)
         signupButton.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         signupButton.clicked.connect(self.signup)
         main_layout.addWidget(signupButton, alignment=Qt.AlignCenter)
@@ -179,8 +86,11 @@ class SignupWindow(QWidget):
         self.setLayout(main_layout)
 
     def signup(self):
+        if self.request:
+            return
         self.username_error.setText("")
         self.password_error.setText("")
+        set_state(self.password_error, "error")
         username = self.username_input.text().strip()
         password = self.password_input.text().strip()
         ip = get_local_ip()
@@ -191,8 +101,7 @@ class SignupWindow(QWidget):
             self.password_error.setText("Password cannot be empty.")
             return
 
-        encrypted_username = encrypt(username)
-        compressed_username = compress(encrypted_username)
+        compressed_username = encode_identifier(username)
         encrypted_password = encrypt(password)
         compressed_password = compress(encrypted_password)
 
@@ -202,9 +111,17 @@ class SignupWindow(QWidget):
             "ip": ip
         }
 
+        # Registering creates the account, so the request is never
+        # cancelled and its result is shown even if the view was hidden.
+        self.request = ApiClient.instance().post(
+            "/api/users/register", json=data)
+        self.request.succeeded.connect(self.handle_signup_response)
+        self.request.failed.connect(self.handle_signup_error)
+
+    def handle_signup_response(self, response):
+        self.request = None
+        import requests
         try:
-            uri = f"{SERVER}/api/users/register"
-            response = requests.post(uri, json=data, timeout=10000)
             response.raise_for_status()
             response_data = {}
 
@@ -221,8 +138,7 @@ class SignupWindow(QWidget):
                 self.password_input.clear()
                 self.username_error.setText("")
                 self.password_error.setText("✓ Account created successfully!")
-                self.password_error.setStyleSheet(
-                    "color: #2E8B57; background: transparent;")
+                set_state(self.password_error, "success")
             else:
                 error = response_data.get("error", "Unknown error")
                 if isinstance(error, dict):
@@ -237,3 +153,8 @@ class SignupWindow(QWidget):
         except json.JSONDecodeError:
             self.username_error.setText("Invalid response from server")
             self.password_error.setText("")
+
+    def handle_signup_error(self, error):
+        self.request = None
+        self.username_error.setText("Network error")
+        self.password_error.setText(str(error))